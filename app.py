@@ -1,10 +1,10 @@
 import streamlit as st
-import pandas as pd
 import json
-from pipeline import IssueAnalyzerPipeline
+import logging
+import logging.handlers
+import re
+import threading
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
 
 # Configure Streamlit page
 st.set_page_config(
@@ -14,9 +14,28 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# The app's own modules; their INFO records are logged, third-party loggers keep their defaults
+APP_LOGGERS = ('pipeline', 'github_parser', 'code_analyzer', 'gemini_analyzer')
+
+@st.cache_resource
+def get_log_handler():
+    """Buffer the app's log records and write them out in batches, once per process.
+    
+    Warnings and errors flush at once; _run_analysis flushes the rest after each run."""
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    handler = logging.handlers.MemoryHandler(1024, flushLevel=logging.WARNING, target=stream)
+    for name in APP_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        logger.propagate = False
+    return handler
+
+get_log_handler()
+
 # Custom CSS for better styling
-st.markdown("""
-<style>
+CUSTOM_CSS = """
     .main-header {
         font-size: 3rem;
         font-weight: bold;
@@ -115,8 +134,51 @@ st.markdown("""
         margin-top: 0.5rem;
         font-size: 0.9rem;
     }
-</style>
-""", unsafe_allow_html=True)
+    .language-list {
+        columns: 2;
+        margin-bottom: 0.5rem;
+    }
+"""
+
+@st.cache_resource
+def get_stylesheet():
+    """Minify the custom CSS once per process."""
+    css = re.sub(r'\s+', ' ', CUSTOM_CSS)
+    css = re.sub(r'\s*([{};:,])\s*', r'\1', css)
+    return f"<style>{css.strip()}</style>"
+
+# Streamlit clears elements that a rerun does not emit, so the (cached) stylesheet is sent every run
+st.markdown(get_stylesheet(), unsafe_allow_html=True)
+
+# Rows per page in the detailed issues view
+ISSUES_PAGE_SIZE = 50
+
+# Severity levels from least to most severe
+SEVERITY_ORDER = ('INFO', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+# Badge markup per severity level, built once
+SEVERITY_BADGES = {
+    severity: f'<span class="severity-{severity.lower()}">{severity}</span>'
+    for severity in SEVERITY_ORDER
+}
+
+# Chart colors per severity level
+SEVERITY_COLORS = {
+    'CRITICAL': '#ff4444',
+    'HIGH': '#ff8800',
+    'MEDIUM': '#ffaa00',
+    'LOW': '#88cc00',
+    'INFO': '#0088cc'
+}
+
+# Severity labels shown in the issues table
+SEVERITY_LABELS = {
+    'CRITICAL': '🔴 CRITICAL',
+    'HIGH': '🟠 HIGH',
+    'MEDIUM': '🟡 MEDIUM',
+    'LOW': '🟢 LOW',
+    'INFO': '🔵 INFO'
+}
 
 def initialize_session_state():
     """Initialize session state variables."""
@@ -125,82 +187,182 @@ def initialize_session_state():
     if 'analyzing' not in st.session_state:
         st.session_state.analyzing = False
 
+@st.cache_resource
+def get_config():
+    """Load the application configuration once per process."""
+    from config import Config
+    return Config()
+
+@st.cache_resource
+def get_analyzer():
+    """Create the Gemini analyzer (and probe the CLI) once per process."""
+    from gemini_analyzer import GeminiAnalyzer
+    return GeminiAnalyzer()
+
+@st.cache_resource
+def get_pipeline():
+    """Build the analysis pipeline once per process."""
+    from pipeline import IssueAnalyzerPipeline
+    return IssueAnalyzerPipeline()
+
+@st.cache_resource
+def get_pipeline_lock():
+    """Lock serializing runs of the shared pipeline, which keeps per-run state such as the clone directory."""
+    return threading.Lock()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _probe_ai():
+    """Check which Gemini backend is usable, at most once a minute."""
+    from gemini_analyzer import GeminiAnalyzer
+    analyzer = GeminiAnalyzer()
+    return {'cli': analyzer.use_cli, 'model': analyzer.api_enabled}
+
+class AnalysisFailed(Exception):
+    """Raised by the cached analysis helper so failed runs are not memoized."""
+
+def config_fingerprint(config):
+    """Summarize the config values that change how a repository is analyzed."""
+    return f"cli={config.USE_GEMINI_CLI}|api_key={bool(config.GEMINI_API_KEY)}"
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_analysis(repo_url: str, cfg_fingerprint: str) -> dict:
+    """Run the pipeline once per repository URL and configuration."""
+    try:
+        with get_pipeline_lock():
+            result = get_pipeline().analyze(repo_url)
+    finally:
+        get_log_handler().flush()
+    if not result['success']:
+        raise AnalysisFailed(result['error'])
+    return result
+
+def get_report_key(report):
+    """Identify an analysis report so views derived from it can be cached."""
+    repository = report.get('repository', {})
+    metadata = report.get('analysis_metadata', {})
+    return f"{repository.get('full_url', '')}@{metadata.get('timestamp', '')}"
+
+@st.cache_data(show_spinner=False)
+def _issues_frame(report_key, _issues):
+    """Build the issues DataFrame once per report; filters, table and CSV export all reuse it."""
+    import pandas as pd
+    return pd.DataFrame(_issues)
+
+@st.cache_data(show_spinner=False)
+def _filter_options(report_key, _issues_frame):
+    """Collect the severity, type and file filter choices."""
+    columns = _issues_frame.reindex(columns=['severity', 'type', 'file_path'])
+    return (
+        sorted(columns['severity'].fillna('MEDIUM').unique(),
+               key=lambda x: SEVERITY_ORDER.index(x) if x in SEVERITY_ORDER else -1, reverse=True),
+        sorted(columns['type'].fillna('unknown').unique()),
+        sorted(columns['file_path'].fillna('N/A').unique())
+    )
+
+@st.cache_data(show_spinner=False)
+def _report_json(report_key, _report):
+    """Serialize the report for the JSON download (compact, for programmatic use)."""
+    return json.dumps(_report, separators=(',', ':')).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _issues_csv(report_key, _issues):
+    """Serialize the issues for the CSV download."""
+    return _issues_frame(report_key, _issues).to_csv(index=False).encode('utf-8')
+
 def render_severity_badge(severity):
     """Render a colored severity badge."""
-    severity_lower = severity.lower()
-    return f'<span class="severity-{severity_lower}">{severity}</span>'
-
-def render_compact_issues_table(issues):
-    """Render issues in a compact table format."""
-    if not issues:
-        return
-    
-    # Prepare data for table
-    table_data = []
-    for issue in issues:
-        table_data.append({
-            'Type': issue.get('type', 'unknown'),
-            'Severity': issue.get('severity', 'MEDIUM'),
-            'Issue': issue.get('title', 'Unknown Issue'),
-            'File': issue.get('file_path', 'N/A').split('/')[-1],  # Just filename
-            'Line': issue.get('line', 'N/A'),
-            'Description': issue.get('description', 'No description')[:100] + '...' if len(issue.get('description', '')) > 100 else issue.get('description', 'No description')
-        })
-    
-    # Create DataFrame and display
-    df = pd.DataFrame(table_data)
-    
-    # Style the dataframe
-    def style_severity(val):
-        colors = {
-            'CRITICAL': 'background-color: #ffebee; color: #c62828; font-weight: bold',
-            'HIGH': 'background-color: #fff3e0; color: #ef6c00; font-weight: bold',
-            'MEDIUM': 'background-color: #fffde7; color: #f57f17; font-weight: bold',
-            'LOW': 'background-color: #f1f8e9; color: #558b2f; font-weight: bold',
-            'INFO': 'background-color: #e3f2fd; color: #1565c0; font-weight: bold'
-        }
-        return colors.get(val, '')
-    
-    styled_df = df.style.applymap(style_severity, subset=['Severity'])
-    
-    st.dataframe(
-        styled_df,
+    badge = SEVERITY_BADGES.get(severity)
+    if badge is None:
+        badge = f'<span class="severity-{severity.lower()}">{severity}</span>'
+    return badge
+
+def render_compact_issues_table(issues_frame, selectable=False):
+    """Render a DataFrame of issues in a compact table format.
+    
+    With ``selectable`` set, a single row can be picked and the positional
+    indices of the selected rows are returned.
+    """
+    if issues_frame.empty:
+        return []
+    
+    import pandas as pd
+    
+    # Build the table with column-wise operations instead of a per-issue loop
+    raw = issues_frame.reindex(columns=['type', 'severity', 'title', 'file_path', 'line', 'description'])
+    description = raw['description'].fillna('No description').astype(str)
+    
+    df = pd.DataFrame({
+        'Type': raw['type'].fillna('unknown'),
+        'Severity': raw['severity'].fillna('MEDIUM'),
+        'Issue': raw['title'].fillna('Unknown Issue'),
+        'File': raw['file_path'].fillna('N/A').astype(str).str.rsplit('/', n=1).str[-1],  # Just filename
+        'Line': raw['line'],
+        'Description': (description.str.slice(0, 100) + '...').where(description.str.len() > 100, description)
+    })
+    
+    # Color-code severities with a single column map instead of a per-cell Styler
+    df['Severity'] = df['Severity'].map(SEVERITY_LABELS).fillna(df['Severity'])
+    
+    column_config = {
+        "Type": st.column_config.TextColumn("Type", width="small"),
+        "Severity": st.column_config.TextColumn("Severity", width="small"),
+        "Issue": st.column_config.TextColumn("Issue", width="medium"),
+        "File": st.column_config.TextColumn("File", width="small"),
+        "Line": st.column_config.NumberColumn("Line", width="small"),
+        "Description": st.column_config.TextColumn("Description", width="large")
+    }
+    
+    if not selectable:
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config=column_config
+        )
+        return []
+    
+    event = st.dataframe(
+        df,
         use_container_width=True,
         hide_index=True,
-        column_config={
-            "Type": st.column_config.TextColumn("Type", width="small"),
-            "Severity": st.column_config.TextColumn("Severity", width="small"),
-            "Issue": st.column_config.TextColumn("Issue", width="medium"),
-            "File": st.column_config.TextColumn("File", width="small"),
-            "Line": st.column_config.NumberColumn("Line", width="small"),
-            "Description": st.column_config.TextColumn("Description", width="large")
-        }
+        column_config=column_config,
+        key="issues_selection",
+        on_select="rerun",
+        selection_mode="single-row"
     )
+    return event.selection.rows
 
-def render_issue_card(issue, index):
+def render_issue_card(issue, index, expanded=False):
     """Render an individual issue card with modern design."""
-    severity = issue.get('severity', 'MEDIUM').lower()
-    severity_badge = render_severity_badge(issue.get('severity', 'MEDIUM'))
+    severity = issue.get('severity', 'MEDIUM')
+    severity_lower = severity.lower()
+    severity_badge = render_severity_badge(severity)
+    title = issue.get('title', 'Unknown Issue')
+    description = issue.get('description', 'No description available')
+    suggestion = issue.get('suggestion')
+    source = issue.get('source')
+    enhanced_suggestion = issue.get('enhanced_suggestion')
     
-    # Create expandable issue card
-    with st.expander(f"**{issue.get('title', 'Unknown Issue')}** {severity_badge}", expanded=False):
+    # Create expandable issue card (expander labels are plain text, so the badge goes inside)
+    with st.expander(f"[{severity}] {title}", expanded=expanded):
+        st.markdown(severity_badge, unsafe_allow_html=True)
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.markdown(f"""
-            <div class="issue-card issue-card-{severity}">
+            <div class="issue-card issue-card-{severity_lower}">
                 <div class="issue-description">
-                    {issue.get('description', 'No description available')}
+                    {description}
                 </div>
             </div>
             """, unsafe_allow_html=True)
             
             # Show suggestion in a nice format
-            if issue.get('suggestion'):
+            if suggestion:
                 st.markdown("**💡 Suggestion:**")
                 st.markdown(f"""
                 <div class="issue-suggestion">
-                    {issue.get('suggestion', 'No suggestion available')}
+                    {suggestion}
                 </div>
                 """, unsafe_allow_html=True)
         
@@ -211,14 +373,14 @@ def render_issue_card(issue, index):
             st.markdown(f"**File:** `{issue.get('file_path', 'N/A')}`")
             st.markdown(f"**Line:** `{issue.get('line', 'N/A')}`")
             
-            if issue.get('source'):
-                st.markdown(f"**Source:** `{issue.get('source')}`")
+            if source:
+                st.markdown(f"**Source:** `{source}`")
         
         # Show enhanced suggestion if available
-        if issue.get('enhanced_suggestion'):
+        if enhanced_suggestion:
             st.markdown("---")
             st.markdown("**🤖 AI-Enhanced Suggestion:**")
-            st.info(issue['enhanced_suggestion'])
+            st.info(enhanced_suggestion)
 
 def render_summary_metrics(report):
     """Render summary metrics."""
@@ -253,25 +415,38 @@ def render_summary_metrics(report):
             delta=f"-{critical_count}" if critical_count > 0 else "0"
         )
 
+@st.cache_data(show_spinner=False)
+def _severity_figure(severity_items):
+    """Build the severity bar chart once per distinct breakdown."""
+    import plotly.graph_objects as go
+    
+    labels = [severity for severity, _ in severity_items]
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=[count for _, count in severity_items],
+        marker_color=[SEVERITY_COLORS.get(severity, '#888888') for severity in labels]
+    ))
+    fig.update_layout(title="Issues by Severity", showlegend=False)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _type_figure(type_items):
+    """Build the issue type pie chart once per distinct breakdown."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Pie(
+        labels=[issue_type for issue_type, _ in type_items],
+        values=[count for _, count in type_items]
+    ))
+    fig.update_layout(title="Issues by Type")
+    return fig
+
 def render_severity_chart(report):
     """Render severity breakdown chart."""
     severity_data = report.get('summary', {}).get('severity_breakdown', {})
     
     if any(severity_data.values()):
-        fig = px.bar(
-            x=list(severity_data.keys()),
-            y=list(severity_data.values()),
-            title="Issues by Severity",
-            color=list(severity_data.keys()),
-            color_discrete_map={
-                'CRITICAL': '#ff4444',
-                'HIGH': '#ff8800',
-                'MEDIUM': '#ffaa00',
-                'LOW': '#88cc00',
-                'INFO': '#0088cc'
-            }
-        )
-        fig.update_layout(showlegend=False)
+        fig = _severity_figure(tuple(severity_data.items()))
         st.plotly_chart(fig, use_container_width=True)
 
 def render_type_chart(report):
@@ -279,13 +454,79 @@ def render_type_chart(report):
     type_data = report.get('summary', {}).get('issue_types', {})
     
     if any(type_data.values()):
-        fig = px.pie(
-            values=list(type_data.values()),
-            names=list(type_data.keys()),
-            title="Issues by Type"
-        )
+        fig = _type_figure(tuple(type_data.items()))
         st.plotly_chart(fig, use_container_width=True)
 
+@st.fragment
+def render_issues_panel(report, issues):
+    """Render the issue filters and results.
+    
+    Running as a fragment, filter and view changes rerun only this panel
+    instead of the whole results page.
+    """
+    # View options and filters
+    report_key = get_report_key(report)
+    issues_frame = _issues_frame(report_key, issues)
+    severity_options, type_options, file_options = _filter_options(report_key, issues_frame)
+    
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    with col1:
+        severity_filter = st.selectbox("🎯 Severity", ["All"] + severity_options)
+    
+    with col2:
+        type_filter = st.selectbox("🏷️ Type", ["All"] + type_options)
+    
+    with col3:
+        file_filter = st.selectbox("📁 File", ["All"] + file_options)
+    
+    with col4:
+        view_mode = st.selectbox(
+            "👁️ View",
+            ["Compact", "Detailed"]
+        )
+    
+    # Apply filters and sort by severity in one vectorized pass
+    import pandas as pd
+    
+    columns = issues_frame.reindex(columns=['severity', 'type', 'file_path'])
+    mask = pd.Series(True, index=columns.index)
+    if severity_filter != "All":
+        mask &= columns['severity'] == severity_filter
+    if type_filter != "All":
+        mask &= columns['type'] == type_filter
+    if file_filter != "All":
+        mask &= columns['file_path'] == file_filter
+    
+    # Ordered categorical: unknown severities become NaN and sort last
+    severity = columns.loc[mask, 'severity'].fillna('MEDIUM')
+    severity = severity.where(severity.isin(SEVERITY_ORDER)).astype(pd.CategoricalDtype(SEVERITY_ORDER, ordered=True))
+    filtered_frame = issues_frame.loc[severity.sort_values(ascending=False, kind='stable', na_position='last').index]
+    
+    # Results summary
+    st.markdown(f"**📊 Showing {len(filtered_frame)} of {len(issues)} issues**")
+    
+    if not filtered_frame.empty:
+        if view_mode == "Compact":
+            render_compact_issues_table(filtered_frame)
+        else:
+            # Page the table so only one page of rows is sent to the browser
+            page_count = -(-len(filtered_frame) // ISSUES_PAGE_SIZE)
+            page = 1
+            if page_count > 1:
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+            page_start = (page - 1) * ISSUES_PAGE_SIZE
+            page_frame = filtered_frame.iloc[page_start:page_start + ISSUES_PAGE_SIZE]
+            
+            # Only the issue selected in the table is rendered as a full card
+            selected_rows = render_compact_issues_table(page_frame, selectable=True)
+            if selected_rows and selected_rows[0] < len(page_frame):
+                issue_index = page_frame.index[selected_rows[0]]
+                render_issue_card(issues[issue_index], issue_index, expanded=True)
+            else:
+                st.caption("Select an issue in the table to see its details.")
+    else:
+        st.info("🎉 No issues found with the current filters!")
+
 def main():
     """Main Streamlit application."""
     initialize_session_state()
@@ -306,8 +547,7 @@ def main():
         )
         
         # Gemini Configuration Status
-        from config import Config
-        config = Config()
+        config = get_config()
         
         st.subheader("🤖 AI Analysis Status")
         
@@ -316,17 +556,17 @@ def main():
             st.info("🔧 **Configured for:** Gemini CLI")
             st.caption(f"CLI Path: `{config.GEMINI_CLI_PATH}`")
             
-            # Check CLI availability
-            from gemini_analyzer import GeminiAnalyzer
-            analyzer = GeminiAnalyzer()
-            if analyzer.use_cli:
-                st.success("✅ Gemini CLI is available and working")
-            else:
-                st.error("❌ Gemini CLI not found - will use API fallback")
-                if config.GEMINI_API_KEY:
-                    st.warning("🔄 Falling back to Gemini API")
+            # Check CLI availability (spawns the CLI, so only on request)
+            if st.toggle("Show AI status"):
+                ai_status = _probe_ai()
+                if ai_status['cli']:
+                    st.success("✅ Gemini CLI is available and working")
                 else:
-                    st.error("❌ No API key configured - using basic analysis only")
+                    st.error("❌ Gemini CLI not found - will use API fallback")
+                    if config.GEMINI_API_KEY:
+                        st.warning("🔄 Falling back to Gemini API")
+                    else:
+                        st.error("❌ No API key configured - using basic analysis only")
         else:
             st.info("🌐 **Configured for:** Gemini API")
             if config.GEMINI_API_KEY:
@@ -342,15 +582,9 @@ def main():
         # Create a compact display of supported languages
         languages = list(config.SUPPORTED_EXTENSIONS.values())
         
-        # Group languages in rows of 2 for compact display
-        for i in range(0, len(languages), 2):
-            col1, col2 = st.columns(2)
-            with col1:
-                if i < len(languages):
-                    st.markdown(f"• **{languages[i].title()}**")
-            with col2:
-                if i + 1 < len(languages):
-                    st.markdown(f"• **{languages[i + 1].title()}**")
+        # Two-column list rendered as a single element
+        language_items = "".join(f"• <b>{language.title()}</b><br>" for language in languages)
+        st.markdown(f'<div class="language-list">{language_items}</div>', unsafe_allow_html=True)
         
         st.caption(f"Total: {len(languages)} languages supported")
         
@@ -362,58 +596,50 @@ def main():
         )
         
         if analyze_button and repo_url:
+            # Proceed straight to the analysis below instead of rerunning to flip the flag
             st.session_state.analyzing = True
-            st.rerun()
     
     # Main content area
     if st.session_state.analyzing:
         st.header("🔄 Analysis in Progress")
         
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        completed = False
+        with st.status("Initializing analysis pipeline...", expanded=True) as status:
+            try:
+                # Show which AI method will be used
+                analyzer = get_analyzer()
+                if analyzer.use_cli:
+                    st.info("🔧 **Using Gemini CLI** for AI analysis")
+                elif analyzer.api_enabled:
+                    st.info("🌐 **Using Gemini API** for AI analysis")
+                else:
+                    st.warning("⚠️ **Using fallback analysis** (no AI configured)")
+                
+                status.update(label="Running analysis...")
+                
+                # Run analysis (repeat runs for the same repository are served from cache)
+                try:
+                    result = _run_analysis(repo_url, config_fingerprint(config))
+                except AnalysisFailed as e:
+                    result = {'success': False, 'error': str(e), 'report': None}
+                
+                # Store result
+                st.session_state.analysis_result = result
+                st.session_state.analyzing = False
+                completed = True
+                
+                # Show success/error
+                if result['success']:
+                    status.update(label="✅ Analysis completed successfully!", state="complete")
+                else:
+                    status.update(label=f"❌ Analysis failed: {result['error']}", state="error")
+                
+            except Exception as e:
+                st.session_state.analyzing = False
+                status.update(label=f"❌ Unexpected error: {str(e)}", state="error")
         
-        try:
-            # Initialize pipeline
-            pipeline = IssueAnalyzerPipeline()
-            
-            # Update progress
-            progress_bar.progress(20)
-            status_text.text("Initializing analysis pipeline...")
-            
-            # Show which AI method will be used
-            from gemini_analyzer import GeminiAnalyzer
-            analyzer = GeminiAnalyzer()
-            if analyzer.use_cli:
-                st.info("🔧 **Using Gemini CLI** for AI analysis")
-            elif analyzer.model:
-                st.info("🌐 **Using Gemini API** for AI analysis")
-            else:
-                st.warning("⚠️ **Using fallback analysis** (no AI configured)")
-            
-            progress_bar.progress(40)
-            status_text.text("Running analysis...")
-            
-            # Run analysis
-            result = pipeline.analyze(repo_url)
-            
-            progress_bar.progress(100)
-            status_text.text("Analysis completed!")
-            
-            # Store result
-            st.session_state.analysis_result = result
-            st.session_state.analyzing = False
-            
-            # Show success/error
-            if result['success']:
-                st.success("✅ Analysis completed successfully!")
-            else:
-                st.error(f"❌ Analysis failed: {result['error']}")
-            
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"❌ Unexpected error: {str(e)}")
-            st.session_state.analyzing = False
+        # A single rerun swaps into the results view (unexpected errors stay on screen)
+        if completed:
             st.rerun()
     
     # Display results
@@ -464,58 +690,7 @@ def main():
             if issues:
                 st.header("🔍 Issues Analysis")
                 
-                # View options and filters
-                col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
-                with col1:
-                    severity_filter = st.selectbox(
-                        "🎯 Severity",
-                        ["All"] + sorted(list(set(issue.get('severity', 'MEDIUM') for issue in issues)), 
-                                        key=lambda x: {'CRITICAL': 5, 'HIGH': 4, 'MEDIUM': 3, 'LOW': 2, 'INFO': 1}.get(x, 0), reverse=True)
-                    )
-                
-                with col2:
-                    type_filter = st.selectbox(
-                        "🏷️ Type",
-                        ["All"] + sorted(list(set(issue.get('type', 'unknown') for issue in issues)))
-                    )
-                
-                with col3:
-                    file_filter = st.selectbox(
-                        "📁 File",
-                        ["All"] + sorted(list(set(issue.get('file_path', 'N/A') for issue in issues)))
-                    )
-                
-                with col4:
-                    view_mode = st.selectbox(
-                        "👁️ View",
-                        ["Detailed", "Compact"]
-                    )
-                
-                # Apply filters
-                filtered_issues = issues
-                if severity_filter != "All":
-                    filtered_issues = [i for i in filtered_issues if i.get('severity') == severity_filter]
-                if type_filter != "All":
-                    filtered_issues = [i for i in filtered_issues if i.get('type') == type_filter]
-                if file_filter != "All":
-                    filtered_issues = [i for i in filtered_issues if i.get('file_path') == file_filter]
-                
-                # Sort by severity
-                severity_order = {'CRITICAL': 5, 'HIGH': 4, 'MEDIUM': 3, 'LOW': 2, 'INFO': 1}
-                filtered_issues.sort(key=lambda x: severity_order.get(x.get('severity', 'MEDIUM'), 0), reverse=True)
-                
-                # Results summary
-                st.markdown(f"**📊 Showing {len(filtered_issues)} of {len(issues)} issues**")
-                
-                if filtered_issues:
-                    if view_mode == "Compact":
-                        render_compact_issues_table(filtered_issues)
-                    else:
-                        # Display detailed issues
-                        for i, issue in enumerate(filtered_issues):
-                            render_issue_card(issue, i)
-                else:
-                    st.info("🎉 No issues found with the current filters!")
+                render_issues_panel(report, issues)
             
             # Export options
             st.header("📤 Export Results")
@@ -523,10 +698,9 @@ def main():
             
             with col1:
                 # JSON export
-                json_data = json.dumps(report, indent=2)
                 st.download_button(
                     label="📄 Download JSON Report",
-                    data=json_data,
+                    data=_report_json(get_report_key(report), report),
                     file_name=f"issue_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
@@ -534,11 +708,9 @@ def main():
             with col2:
                 # CSV export for issues
                 if issues:
-                    df = pd.DataFrame(issues)
-                    csv_data = df.to_csv(index=False)
                     st.download_button(
                         label="📊 Download CSV Issues",
-                        data=csv_data,
+                        data=_issues_csv(get_report_key(report), issues),
                         file_name=f"issues_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                         mime="text/csv"
                     )
@@ -548,7 +720,7 @@ def main():
     
     # Footer
     st.markdown("---")
-    st.markdown("**IssueAnalyzer** - Powered by Tree-sitter, Gemini AI, and LangGraph")
+    st.markdown("**IssueAnalyzer** - Powered by Gemini AI and LangGraph")
 
 if __name__ == "__main__":
     main()
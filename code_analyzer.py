@@ -1,77 +1,253 @@
-import tree_sitter
-from tree_sitter import Language, Parser
+import ast
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import numpy as np
 import os
-from typing import List, Dict, Any, Optional
-from pathlib import Path
-import subprocess
-import tempfile
+import re
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from config import Config
 
-class TreeSitterAnalyzer:
-    """Code analysis using Tree-sitter for parsing."""
+logger = logging.getLogger(__name__)
+
+# Line-level checks, compiled once at import. Each check is a named group in a
+# per-category alternation, so a file is scanned once per category instead of
+# once per check and line.
+#
+# Source files are untrusted input, so every check matches in linear time: a
+# match attempt may only start where it cannot repeat the work of a failed one.
+# ``(?=(?P<x>...))(?P=x)`` acts as an atomic group (a lookahead is never
+# re-entered once it matched); ``(?>...)`` would need Python 3.11.
+#   secret:    starts only at identifier starts and takes the identifier whole,
+#              so a long identifier is never rescanned from inside
+#   range_len: anchored at line starts and committed to the first ``for``
+_MAX_LINE_LENGTH = 120
+_SECRET_CHECK = (
+    r"(?P<secret>\b(?=\w*?(?i:password|api_key|secret|token))"
+    r"(?=(?P<_identifier>\w+))(?P=_identifier)\s*=\s*['\"])"
+)
+_EVAL_CHECK = r"(?P<eval>\beval\s*\()"
+_RANGE_LEN_CHECK = r"^(?P<range_len>(?=(?P<_loop_head>[^\n]*?\bfor\b))(?P=_loop_head)[^\n]*?\brange\(len\()"
+
+_SECURITY_PATTERNS = {
+    'python': re.compile(f"{_SECRET_CHECK}|{_EVAL_CHECK}"),
+}
+_DEFAULT_SECURITY_PATTERN = re.compile(_SECRET_CHECK)
+
+# Per language: a literal every match contains (checked first, as a cheap
+# prefilter) and the pattern
+_PERFORMANCE_CHECKS = {
+    'python': ('range(len(', re.compile(_RANGE_LEN_CHECK, re.MULTILINE)),
+}
+
+# Above this many undocumented functions in a file, report a single roll-up issue
+_MAX_DOCSTRING_ISSUES = 10
+
+# Functions spanning more lines than this are reported as too long
+_MAX_FUNCTION_LINES = 50
+
+# Literals at least one of which must appear (case-insensitively) for a
+# security check to match; most files contain none and skip those checks.
+# Bytes, so they can be searched in an ASCII-lowercased encoding of the file.
+_SECURITY_KEYWORDS = (b'password', b'api_key', b'secret', b'token', b'eval')
+
+@lru_cache(maxsize=4)
+def _newline_offsets(code: str) -> np.ndarray:
+    """Return the (character) offsets of every newline in ``code``, ascending.
+    
+    Cached for the last few sources so every check on a file shares one index;
+    the array is read-only for that reason.
+    """
+    if code.isascii():
+        buffer = np.frombuffer(code.encode('ascii'), dtype=np.uint8)
+    else:
+        # One code unit per character keeps offsets aligned with str indices
+        buffer = np.frombuffer(code.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    
+    # Files are capped well below 2 GiB, so 32-bit offsets halve the index size
+    dtype = np.int32 if len(code) <= np.iinfo(np.int32).max else np.int64
+    offsets = np.flatnonzero(buffer == 0x0A).astype(dtype)
+    offsets.flags.writeable = False
+    return offsets
+
+# Issue templates for the named groups above
+_LINE_ISSUE_TEMPLATES = {
+    'secret': {
+        'type': 'security',
+        'severity': 'HIGH',
+        'title': 'Potential Hardcoded Secret',
+        'description': 'Line {line} may contain a hardcoded secret',
+        'suggestion': 'Use environment variables or secure configuration for secrets'
+    },
+    'eval': {
+        'type': 'security',
+        'severity': 'CRITICAL',
+        'title': 'Dangerous eval() Usage',
+        'description': 'Line {line} uses eval() which can execute arbitrary code',
+        'suggestion': 'Avoid eval(). Use safer alternatives like ast.literal_eval() for simple cases'
+    },
+    'range_len': {
+        'type': 'performance',
+        'severity': 'MEDIUM',
+        'title': 'Inefficient Loop',
+        'description': 'Line {line} uses range(len()) pattern',
+        'suggestion': 'Use enumerate() or iterate directly over the collection'
+    }
+}
+
+class StructureAnalyzer:
+    """Code structure analysis (ast for Python, line patterns otherwise), cached by content hash."""
+    
+    # Structures kept in memory per process, keyed like the SQLite cache
+    MEMO_SIZE = 1024
+    
+    # Salted into cache keys; bump whenever the parsed structure changes, so
+    # structures cached by older versions are no longer returned
+    STRUCTURE_VERSION = 2
+    
+    # Parsed structures buffered before they are written to SQLite in one transaction
+    PENDING_WRITES = 64
     
     def __init__(self):
-        self.parsers = {}
-        self.languages = {}
-        self._setup_languages()
+        self._memo = {}
+        self._cache = None
+        self._cache_failed = False
+        self._cache_lock = threading.Lock()
+        self._pending = []
     
-    def _setup_languages(self):
-        """Setup Tree-sitter languages."""
+    def analyze_code_structure(self, code: str, language: str, lines: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Analyze code structure (functions, classes, imports) of ``code``.
+        
+        Results are cached by a hash of the language and content, in memory and in
+        SQLite, so unchanged files are not parsed again across runs; call flush()
+        after a batch to write new structures out. ``lines`` may
+        carry ``code`` already split on newlines to avoid splitting it again.
+        """
+        key = hashlib.sha256(
+            f"{self.STRUCTURE_VERSION}\0{language}\0{code}".encode('utf-8', 'surrogatepass')
+        ).digest()
+        structure = self._memo.get(key)
+        if structure is None:
+            structure = self._load_cached_structure(key)
+            if structure is None:
+                structure = self._parse_code_structure(code, language, lines)
+                self._store_cached_structure(key, structure)
+            self._remember(key, structure)
+        return structure
+    
+    def _parse_code_structure(self, code: str, language: str, lines: Optional[List[str]]) -> Dict[str, Any]:
+        """Parse ``code`` into its structure, bypassing the caches."""
+        if lines is None:
+            lines = code.split('\n')
+        if language == 'python':
+            structure = self._python_code_analysis(code, lines)
+            if structure is not None:
+                return structure
+        return self._basic_code_analysis(code, language, lines)
+    
+    def _python_code_analysis(self, code: str, lines: List[str]) -> Optional[Dict[str, Any]]:
+        """Structure of Python code from its ast, or None when it does not parse.
+        
+        Functions, in source order, also carry their last line and whether they have
+        a docstring, which the line-based analysis cannot tell.
+        """
         try:
-            # Try to build languages if not already built
-            self._build_languages()
-            
-            # Load languages
-            language_configs = {
-                'python': 'tree-sitter-python',
-                'javascript': 'tree-sitter-javascript', 
-                'java': 'tree-sitter-java',
-                'cpp': 'tree-sitter-cpp',
-                'c': 'tree-sitter-c'
-            }
-            
-            for lang_name, lib_name in language_configs.items():
-                try:
-                    # This is a simplified approach - in production you'd build the .so files
-                    parser = Parser()
-                    self.parsers[lang_name] = parser
-                except Exception as e:
-                    print(f"Could not load {lang_name} parser: {e}")
-                    
-        except Exception as e:
-            print(f"Error setting up Tree-sitter: {e}")
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return None
+        
+        analysis = {
+            'functions': [],
+            'classes': [],
+            'imports': [],
+            'complexity': 1,
+            'lines_of_code': len(lines)
+        }
+        imports = []
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                analysis['functions'].append({
+                    'name': node.name,
+                    'line': node.lineno,
+                    'end_line': node.end_lineno,
+                    'parameters': [arg.arg for arg in node.args.args],
+                    'has_docstring': ast.get_docstring(node) is not None
+                })
+            elif isinstance(node, ast.ClassDef):
+                analysis['classes'].append({'name': node.name, 'line': node.lineno})
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                imports.append(node.lineno)
+        
+        analysis['functions'].sort(key=lambda func: func['line'])
+        # ast counts lone '\r' as a line break too, so stay within the '\n'-split lines
+        analysis['imports'] = [lines[line - 1].strip() for line in sorted(imports) if line <= len(lines)]
+        return analysis
     
-    def _build_languages(self):
-        """Build Tree-sitter language libraries."""
-        # This would typically build the .so files, but for simplicity
-        # we'll use a fallback approach with basic parsing
-        pass
+    def _remember(self, key: bytes, structure: Dict[str, Any]):
+        """Keep a structure in the in-process memo, evicting the oldest entry when full."""
+        if len(self._memo) >= self.MEMO_SIZE:
+            self._memo.pop(next(iter(self._memo)))
+        self._memo[key] = structure
     
-    def analyze_code_structure(self, code: str, language: str) -> Dict[str, Any]:
-        """Analyze code structure using Tree-sitter."""
+    def _get_cache(self) -> Optional[sqlite3.Connection]:
+        """Open the on-disk structure cache on first use; a failed open is not retried."""
+        if self._cache is None and not self._cache_failed and Config.STRUCTURE_CACHE_PATH:
+            try:
+                self._cache = sqlite3.connect(Config.STRUCTURE_CACHE_PATH, check_same_thread=False)
+                self._cache.execute(
+                    "CREATE TABLE IF NOT EXISTS ast_cache (hash BLOB PRIMARY KEY, structure TEXT)"
+                )
+                self._cache.commit()
+            except sqlite3.Error as e:
+                logger.warning("Structure cache unavailable: %s", e)
+                self._cache = None
+                self._cache_failed = True
+        return self._cache
+    
+    def _load_cached_structure(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Look up a previously parsed structure by content hash."""
+        with self._cache_lock:
+            cache = self._get_cache()
+            if cache is None:
+                return None
+            try:
+                row = cache.execute("SELECT structure FROM ast_cache WHERE hash = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Error reading structure cache: %s", e)
+                return None
+        return json.loads(row[0]) if row else None
+    
+    def _store_cached_structure(self, key: bytes, structure: Dict[str, Any]):
+        """Queue a parsed structure to be persisted under its content hash."""
+        with self._cache_lock:
+            if self._get_cache() is None:
+                return
+            self._pending.append((key, json.dumps(structure)))
+            if len(self._pending) >= self.PENDING_WRITES:
+                self._write_pending()
+    
+    def flush(self):
+        """Write queued structures to the on-disk cache in a single transaction."""
+        with self._cache_lock:
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Write queued structures; the caller holds the cache lock."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
         try:
-            if language in self.parsers:
-                parser = self.parsers[language]
-                tree = parser.parse(bytes(code, 'utf8'))
-                
-                return {
-                    'functions': self._extract_functions(tree.root_node, code),
-                    'classes': self._extract_classes(tree.root_node, code),
-                    'imports': self._extract_imports(tree.root_node, code),
-                    'complexity': self._calculate_complexity(tree.root_node),
-                    'lines_of_code': len(code.split('\n'))
-                }
-            else:
-                # Fallback to basic analysis
-                return self._basic_code_analysis(code, language)
-                
-        except Exception as e:
-            print(f"Error analyzing code structure: {e}")
-            return self._basic_code_analysis(code, language)
+            self._cache.executemany("INSERT OR REPLACE INTO ast_cache (hash, structure) VALUES (?, ?)", pending)
+            self._cache.commit()
+        except sqlite3.Error as e:
+            logger.warning("Error writing structure cache: %s", e)
     
-    def _basic_code_analysis(self, code: str, language: str) -> Dict[str, Any]:
-        """Basic code analysis without Tree-sitter."""
-        lines = code.split('\n')
-        
+    def _basic_code_analysis(self, code: str, language: str, lines: List[str]) -> Dict[str, Any]:
+        """Line-based code structure analysis."""
         analysis = {
             'functions': [],
             'classes': [],
@@ -118,29 +294,6 @@ class TreeSitterAnalyzer:
         
         return analysis
     
-    def _extract_functions(self, node, code: str) -> List[Dict]:
-        """Extract function definitions from AST."""
-        functions = []
-        # Implementation would traverse the AST to find function nodes
-        return functions
-    
-    def _extract_classes(self, node, code: str) -> List[Dict]:
-        """Extract class definitions from AST."""
-        classes = []
-        # Implementation would traverse the AST to find class nodes
-        return classes
-    
-    def _extract_imports(self, node, code: str) -> List[str]:
-        """Extract import statements from AST."""
-        imports = []
-        # Implementation would traverse the AST to find import nodes
-        return imports
-    
-    def _calculate_complexity(self, node) -> int:
-        """Calculate cyclomatic complexity."""
-        # Basic complexity calculation
-        return 1
-    
     def _extract_parameters(self, function_line: str) -> List[str]:
         """Extract function parameters from function definition line."""
         try:
@@ -155,131 +308,203 @@ class StaticAnalyzer:
     """Static code analysis for finding common issues."""
     
     def __init__(self):
-        self.tree_analyzer = TreeSitterAnalyzer()
+        self.structure_analyzer = StructureAnalyzer()
+    
+    def flush(self):
+        """Write structures parsed since the last flush to the on-disk cache."""
+        self.structure_analyzer.flush()
     
-    def analyze_file(self, file_content: str, language: str, file_path: str) -> List[Dict]:
-        """Analyze a single file for issues."""
+    def analyze_file(self, file_content: str, language: str, file_path: str, size: Optional[int] = None) -> List[Dict]:
+        """Analyze a single file for issues.
+        
+        ``size`` is the file's size in bytes, when known (extraction records it, and
+        leaves the content of oversized files empty); otherwise it is measured.
+        """
+        if size is None:
+            size = len(file_content.encode('utf-8', 'surrogatepass'))
+        
+        # Oversized files are reported rather than parsed
+        if size > Config.MAX_FILE_SIZE:
+            return [self._file_too_large_issue(file_path)]
+        
         issues = []
         
+        # Split once; the structure analysis and line-based checks share the result
+        lines = file_content.split('\n')
+        
         # Get code structure
-        structure = self.tree_analyzer.analyze_code_structure(file_content, language)
+        structure = self.structure_analyzer.analyze_code_structure(file_content, language, lines)
         
-        # Run various analysis checks
-        issues.extend(self._check_code_quality(file_content, language, structure))
-        issues.extend(self._check_security_issues(file_content, language))
-        issues.extend(self._check_performance_issues(file_content, language, structure))
-        issues.extend(self._check_maintainability(file_content, language, structure))
+        # Run various analysis checks; each builds its issues complete with the file context
+        issues.extend(self._check_code_quality(file_content, language, structure, file_path))
+        issues.extend(self._check_lines(file_content, lines, language, file_path))
+        issues.extend(self._check_maintainability(file_content, language, structure, file_path))
         
-        # Add file context to issues
-        for issue in issues:
-            issue['file_path'] = file_path
-            
         return issues
     
-    def _check_code_quality(self, code: str, language: str, structure: Dict) -> List[Dict]:
+    def _file_too_large_issue(self, file_path: str) -> Dict:
+        """Issue reported in place of analyzing a file over Config.MAX_FILE_SIZE."""
+        return {
+            'type': 'code_quality',
+            'severity': 'INFO',
+            'title': 'File Too Large',
+            'description': f'File exceeds {Config.MAX_FILE_SIZE} bytes and was not analyzed',
+            'line': 1,
+            'suggestion': 'Split very large files into smaller modules',
+            'file_path': file_path
+        }
+    
+    def _check_code_quality(self, code: str, language: str, structure: Dict, file_path: str) -> List[Dict]:
         """Check for code quality issues."""
         issues = []
-        lines = code.split('\n')
         
-        # Check for long functions
+        # Check for long functions; only ast-parsed structures know where a function ends
         for func in structure.get('functions', []):
-            if 'line' in func:
-                # Estimate function length (simplified)
-                func_lines = 20  # This would be calculated properly
-                if func_lines > 50:
+            if 'end_line' in func:
+                func_lines = func['end_line'] - func['line'] + 1
+                if func_lines > _MAX_FUNCTION_LINES:
                     issues.append({
                         'type': 'code_quality',
                         'severity': 'MEDIUM',
                         'title': 'Long Function',
                         'description': f"Function '{func['name']}' is too long ({func_lines} lines)",
                         'line': func['line'],
-                        'suggestion': 'Consider breaking this function into smaller, more focused functions'
+                        'suggestion': 'Consider breaking this function into smaller, more focused functions',
+                        'file_path': file_path
                     })
         
+        return issues
+    
+    def _check_lines(self, code: str, lines: List[str], language: str, file_path: str) -> List[Dict]:
+        """Check for line-level code quality, security and performance issues."""
+        issues = []
+        
         # Check for long lines
         for i, line in enumerate(lines):
-            if len(line) > 120:
+            if len(line) > _MAX_LINE_LENGTH:
                 issues.append({
                     'type': 'code_quality',
                     'severity': 'LOW',
                     'title': 'Long Line',
-                    'description': f'Line {i+1} exceeds 120 characters ({len(line)} characters)',
+                    'description': f'Line {i+1} exceeds {_MAX_LINE_LENGTH} characters ({len(line)} characters)',
                     'line': i + 1,
-                    'suggestion': 'Break long lines into multiple lines for better readability'
+                    'suggestion': 'Break long lines into multiple lines for better readability',
+                    'file_path': file_path
                 })
         
-        return issues
-    
-    def _check_security_issues(self, code: str, language: str) -> List[Dict]:
-        """Check for potential security issues."""
-        issues = []
-        lines = code.split('\n')
+        # Security checks; a cheap substring prefilter skips them for most files.
+        # The keywords are ASCII, so bytes.lower() (ASCII-only, one C pass) is
+        # enough and much cheaper than str.lower() on non-ASCII sources.
+        lowered = code.encode('utf-8', 'surrogatepass').lower()
+        if any(keyword in lowered for keyword in _SECURITY_KEYWORDS):
+            pattern = _SECURITY_PATTERNS.get(language, _DEFAULT_SECURITY_PATTERN)
+            issues.extend(self._scan_line_checks(pattern, code, file_path))
         
-        # Check for hardcoded secrets
-        secret_patterns = ['password', 'api_key', 'secret', 'token']
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for pattern in secret_patterns:
-                if pattern in line_lower and '=' in line and ('"' in line or "'" in line):
-                    issues.append({
-                        'type': 'security',
-                        'severity': 'HIGH',
-                        'title': 'Potential Hardcoded Secret',
-                        'description': f'Line {i+1} may contain a hardcoded secret',
-                        'line': i + 1,
-                        'suggestion': 'Use environment variables or secure configuration for secrets'
-                    })
-        
-        # Language-specific security checks
-        if language == 'python':
-            for i, line in enumerate(lines):
-                if 'eval(' in line:
-                    issues.append({
-                        'type': 'security',
-                        'severity': 'CRITICAL',
-                        'title': 'Dangerous eval() Usage',
-                        'description': f'Line {i+1} uses eval() which can execute arbitrary code',
-                        'line': i + 1,
-                        'suggestion': 'Avoid eval(). Use safer alternatives like ast.literal_eval() for simple cases'
-                    })
+        # Performance checks
+        literal, pattern = _PERFORMANCE_CHECKS.get(language, (None, None))
+        if pattern is not None and literal in code:
+            issues.extend(self._scan_line_checks(pattern, code, file_path))
         
         return issues
     
-    def _check_performance_issues(self, code: str, language: str, structure: Dict) -> List[Dict]:
-        """Check for performance issues."""
+    def _scan_line_checks(self, pattern, code: str, file_path: str) -> List[Dict]:
+        """Turn matches of a line-check pattern into issues, one per check and line."""
         issues = []
-        lines = code.split('\n')
+        newline_offsets = None
+        seen = set()
         
-        if language == 'python':
-            # Check for inefficient loops
-            for i, line in enumerate(lines):
-                if 'for' in line and 'range(len(' in line:
-                    issues.append({
-                        'type': 'performance',
-                        'severity': 'MEDIUM',
-                        'title': 'Inefficient Loop',
-                        'description': f'Line {i+1} uses range(len()) pattern',
-                        'line': i + 1,
-                        'suggestion': 'Use enumerate() or iterate directly over the collection'
-                    })
+        for match in pattern.finditer(code):
+            if newline_offsets is None:
+                newline_offsets = _newline_offsets(code)
+            line = int(newline_offsets.searchsorted(match.start(), side='right')) + 1
+            
+            check = match.lastgroup
+            if (check, line) in seen:
+                continue
+            seen.add((check, line))
+            
+            template = _LINE_ISSUE_TEMPLATES[check]
+            issues.append({
+                'type': template['type'],
+                'severity': template['severity'],
+                'title': template['title'],
+                'description': template['description'].format(line=line),
+                'line': line,
+                'suggestion': template['suggestion'],
+                'file_path': file_path
+            })
         
         return issues
     
-    def _check_maintainability(self, code: str, language: str, structure: Dict) -> List[Dict]:
+    def _check_maintainability(self, code: str, language: str, structure: Dict, file_path: str) -> List[Dict]:
         """Check for maintainability issues."""
         issues = []
         
         # Check for missing docstrings
         if language == 'python':
-            for func in structure.get('functions', []):
-                # This is simplified - would check if function has docstring
+            # Only ast-parsed structures record docstrings; code that does not
+            # parse cannot be checked reliably
+            undocumented = [
+                (func['name'], func['line'])
+                for func in structure.get('functions', [])
+                if func.get('has_docstring') is False
+            ]
+            if len(undocumented) > _MAX_DOCSTRING_ISSUES:
+                # Roll many findings up into one issue rather than one per function
                 issues.append({
                     'type': 'maintainability',
                     'severity': 'LOW',
-                    'title': 'Missing Documentation',
-                    'description': f"Function '{func['name']}' lacks documentation",
-                    'line': func.get('line', 1),
-                    'suggestion': 'Add docstring to explain function purpose, parameters, and return value'
+                    'title': f'{len(undocumented)} Functions Lack Documentation',
+                    'description': f"{len(undocumented)} functions lack documentation, starting with "
+                                   f"'{undocumented[0][0]}'",
+                    'line': undocumented[0][1],
+                    'suggestion': 'Add docstrings to explain function purpose, parameters, and return value',
+                    'file_path': file_path,
+                    'count': len(undocumented),
+                    'lines': [line for _, line in undocumented]
                 })
+            else:
+                for name, line in undocumented:
+                    issues.append({
+                        'type': 'maintainability',
+                        'severity': 'LOW',
+                        'title': 'Missing Documentation',
+                        'description': f"Function '{name}' lacks documentation",
+                        'line': line,
+                        'suggestion': 'Add docstring to explain function purpose, parameters, and return value',
+                        'file_path': file_path
+                    })
         
         return issues
+
+# Analyzer owned by each worker process of analyze_files; created by the pool
+# initializer since the cache connection and its lock cannot be pickled
+_worker_analyzer = None
+
+def _init_worker():
+    """Create the per-process analyzer used by _analyze_chunk."""
+    global _worker_analyzer
+    _worker_analyzer = StaticAnalyzer()
+
+def _analyze_chunk(files: List[Dict[str, str]]) -> List[List[Dict]]:
+    """Analyze a few extracted files inside a worker process, then flush its structure cache."""
+    results = [_worker_analyzer.analyze_file(f["content"], f["language"], f["path"], f.get("size")) for f in files]
+    _worker_analyzer.flush()
+    return results
+
+def analyze_files(files: List[Dict[str, str]], analyzer: Optional[StaticAnalyzer] = None) -> List[Dict]:
+    """Analyze extracted files in parallel across processes, returning all issues in file order.
+    
+    Small batches run serially on ``analyzer`` (or a new one) to skip the pool start-up cost.
+    """
+    workers = min(len(files), os.cpu_count() or 1)
+    if workers < 2:
+        analyzer = analyzer or StaticAnalyzer()
+        results = [analyzer.analyze_file(f["content"], f["language"], f["path"], f.get("size")) for f in files]
+        analyzer.flush()
+    else:
+        chunks = [files[start:start + 4] for start in range(0, len(files), 4)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            results = [result for chunk in executor.map(_analyze_chunk, chunks) for result in chunk]
+    
+    return [issue for file_issues in results for issue in file_issues]
@@ -11,6 +11,15 @@ class Config:
     USE_GEMINI_CLI = os.getenv('USE_GEMINI_CLI', 'false').lower() == 'true'
     GEMINI_CLI_PATH = os.getenv('GEMINI_CLI_PATH', 'gemini')
     
+    # Maximum Gemini requests (API calls or CLI processes) in flight at once
+    GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', '4'))
+    
+    # GitHub API configuration (a token raises the rate limit from 60 to 5000 requests/hour)
+    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+    
+    # Seconds a GitHub API response is reused before it is revalidated with its ETag
+    GITHUB_API_CACHE_TTL = int(os.getenv('GITHUB_API_CACHE_TTL', '3600'))
+    
     # Supported file extensions for analysis
     SUPPORTED_EXTENSIONS = {
         '.py': 'python',
@@ -39,3 +48,14 @@ class Config:
     
     # Maximum file size in bytes (1MB)
     MAX_FILE_SIZE = 1024 * 1024
+    
+    # Commits of history fetched when cloning (only the tip tree is analyzed)
+    CLONE_DEPTH = int(os.getenv('CLONE_DEPTH', '1'))
+    
+    # Directory keeping bare clones between analyses, one per owner/repo; nothing is
+    # evicted, so it is off (empty) unless set
+    CLONE_CACHE_DIR = os.getenv('CLONE_CACHE_DIR', '')
+    
+    # SQLite file caching parsed code structures by content hash; nothing is
+    # evicted, so it is off (empty) unless set
+    STRUCTURE_CACHE_PATH = os.getenv('STRUCTURE_CACHE_PATH', '')
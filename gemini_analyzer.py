@@ -1,75 +1,228 @@
-import google.generativeai as genai
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import hashlib
+import io
 import json
-import subprocess
-import tempfile
+import logging
 import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import tokenize
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Response lines that mention an issue marker or a runtime problem, matched over
+# the whole response at once. Each match is a whole line (strip it); matching
+# surrounding whitespace in the pattern instead is quadratic on long blank runs.
+_ISSUE_MARKERS = re.compile(
+    r'^[^\n]*(?:issue:|problem:|bug:|error:)[^\n]*',
+    re.IGNORECASE | re.MULTILINE
+)
+_RUNTIME_MARKERS = re.compile(
+    r'^[^\n]*(?:exception|error|crash|fail|issue|problem)[^\n]*',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Tokens checked by the fallback analysis
+_DIVISION_OPERATORS = frozenset(('/', '//', '/=', '//='))
+_TRIVIA_TOKENS = frozenset((tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT))
+
+# Sentinel files recording a successful CLI probe, valid for a day per binary
+_CLI_PROBE_DIR = Path.home() / '.cache' / 'issue_analyzer'
+_CLI_PROBE_TTL = 24 * 60 * 60
+
+# CLI paths that probed successfully in this process; failures are not remembered,
+# so a CLI installed after startup is picked up by the next probe
+_CLI_AVAILABLE_PATHS = set()
+
+def _cli_available(cli_path: str) -> bool:
+    """Check whether the Gemini CLI at ``cli_path`` runs, remembering successes in memory and on disk."""
+    if cli_path in _CLI_AVAILABLE_PATHS:
+        return True
+    
+    resolved = shutil.which(cli_path)
+    if resolved is None:
+        return False
+    
+    key = f"{resolved}:{os.stat(resolved).st_mtime_ns}"
+    sentinel = _CLI_PROBE_DIR / f"cli_ok_{hashlib.sha1(key.encode()).hexdigest()}"
+    try:
+        if time.time() - sentinel.stat().st_mtime < _CLI_PROBE_TTL:
+            _CLI_AVAILABLE_PATHS.add(cli_path)
+            return True
+    except OSError:
+        pass
+    
+    try:
+        result = subprocess.run([resolved, '--version'], capture_output=True, text=True, timeout=10)
+    except (subprocess.SubprocessError, OSError):
+        return False
+    
+    if result.returncode != 0:
+        return False
+    
+    try:
+        _CLI_PROBE_DIR.mkdir(parents=True, exist_ok=True)
+        sentinel.touch()
+    except OSError:
+        pass
+    _CLI_AVAILABLE_PATHS.add(cli_path)
+    return True
+
+# Invariant tail of the analysis prompts (everything after the code), built once
+_ANALYSIS_INSTRUCTIONS = """
+```
+
+Please identify:
+1. Logic errors or potential bugs
+2. Code smell and design issues
+3. Performance problems
+4. Security vulnerabilities
+5. Maintainability concerns
+
+For each issue found, provide:
+- Type of issue
+- Severity level (CRITICAL, HIGH, MEDIUM, LOW, INFO)
+- Line number (if applicable)
+- Description of the problem
+- Suggested improvement
+
+Format your response as JSON with this structure:
+{
+    "issues": [
+        {
+            "type": "logic_error|security|performance|maintainability|code_smell",
+            "severity": "CRITICAL|HIGH|MEDIUM|LOW|INFO",
+            "title": "Brief title",
+            "description": "Detailed description",
+            "line": line_number,
+            "suggestion": "Improvement suggestion"
+        }
+    ]
+}
+
+Focus on practical, actionable feedback that will improve code quality.
+"""
+
+_BATCH_ANALYSIS_INSTRUCTIONS = """Please identify:
+1. Logic errors or potential bugs
+2. Code smell and design issues
+3. Performance problems
+4. Security vulnerabilities
+5. Maintainability concerns
+
+For each issue found, provide:
+- File the issue belongs to (exactly as given above)
+- Type of issue
+- Severity level (CRITICAL, HIGH, MEDIUM, LOW, INFO)
+- Line number (if applicable)
+- Description of the problem
+- Suggested improvement
+
+Format your response as JSON with this structure:
+{
+    "issues": [
+        {
+            "file": "path/of/file",
+            "type": "logic_error|security|performance|maintainability|code_smell",
+            "severity": "CRITICAL|HIGH|MEDIUM|LOW|INFO",
+            "title": "Brief title",
+            "description": "Detailed description",
+            "line": line_number,
+            "suggestion": "Improvement suggestion"
+        }
+    ]
+}
+
+Focus on practical, actionable feedback that will improve code quality.
+"""
+
 class GeminiAnalyzer:
     """Gemini AI integration for advanced code analysis and logic simulation."""
     
+    # Files sent to Gemini (CLI or API) in a single prompt
+    BATCH_SIZE = 5
+    
+    # Enhanced suggestions remembered across analyses, keyed by issue content
+    SUGGESTION_CACHE_SIZE = 4096
+    
     def __init__(self):
         self.config = Config()
         self.use_cli = self.config.USE_GEMINI_CLI
+        self.api_enabled = False
+        self._model = None
+        # Caps Gemini requests in flight across all of this analyzer's thread pools
+        self._request_slots = threading.BoundedSemaphore(self.config.GEMINI_MAX_CONCURRENT_REQUESTS)
+        self._suggestions = {}
+        self._suggestions_lock = threading.Lock()
         
         if self.use_cli:
             # Check if Gemini CLI is available
             if self._check_cli_availability():
-                self.model = None  # We'll use CLI instead
-                print("✅ Using Gemini CLI for analysis")
+                logger.info("Using Gemini CLI for analysis")
             else:
-                print("⚠️ Gemini CLI not found, falling back to API")
+                logger.warning("Gemini CLI not found, falling back to API")
                 self.use_cli = False
         
         if not self.use_cli:
             if self.config.GEMINI_API_KEY:
-                genai.configure(api_key=self.config.GEMINI_API_KEY)
-                self.model = genai.GenerativeModel('gemini-pro')
-                print("✅ Using Gemini API for analysis")
+                # The client library and model are only set up on first use
+                self.api_enabled = True
+                logger.info("Using Gemini API for analysis")
             else:
-                self.model = None
-                print("Warning: Neither Gemini CLI nor API configured. Using fallback analysis.")
+                logger.warning("Neither Gemini CLI nor API configured. Using fallback analysis.")
+    
+    @property
+    def model(self):
+        """Gemini API model, created on first access; None when the API is not in use."""
+        if self._model is None and self.api_enabled:
+            import google.generativeai as genai
+            genai.configure(api_key=self.config.GEMINI_API_KEY)
+            self._model = genai.GenerativeModel('gemini-pro')
+        return self._model
+    
+    def _generate_content(self, prompt: str):
+        """Send a prompt to the Gemini API, waiting for a free request slot."""
+        with self._request_slots:
+            return self.model.generate_content(prompt)
+    
+    def _map_concurrently(self, func, items: List) -> List:
+        """Apply ``func`` to ``items`` on a thread pool (calls are I/O bound), keeping their order."""
+        if len(items) < 2:
+            return [func(item) for item in items]
+        
+        workers = min(len(items), self.config.GEMINI_MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
     
     def _check_cli_availability(self) -> bool:
         """Check if Gemini CLI is available."""
-        try:
-            result = subprocess.run(
-                [self.config.GEMINI_CLI_PATH, '--version'], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        return _cli_available(self.config.GEMINI_CLI_PATH)
     
     def _analyze_with_cli(self, prompt: str) -> str:
         """Analyze code using Gemini CLI."""
         try:
-            # Create temporary file for the prompt
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-                temp_file.write(prompt)
-                temp_file_path = temp_file.name
-            
-            # Run Gemini CLI
-            result = subprocess.run([
-                self.config.GEMINI_CLI_PATH,
-                'generate',
-                '--file', temp_file_path
-            ], capture_output=True, text=True, timeout=60)
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+            # Run Gemini CLI, piping the prompt through stdin
+            with self._request_slots:
+                result = subprocess.run([
+                    self.config.GEMINI_CLI_PATH,
+                    'generate',
+                    '--file', '-'
+                ], input=prompt, capture_output=True, text=True, timeout=60)
             
             if result.returncode == 0:
                 return result.stdout
             else:
-                print(f"Gemini CLI error: {result.stderr}")
+                logger.warning("Gemini CLI error: %s", result.stderr)
                 return ""
                 
         except Exception as e:
-            print(f"Error running Gemini CLI: {e}")
+            logger.warning("Error running Gemini CLI: %s", e)
             return ""
     
     def analyze_code_logic(self, code: str, language: str, file_path: str) -> List[Dict]:
@@ -81,15 +234,52 @@ class GeminiAnalyzer:
         
         try:
             prompt = self._create_analysis_prompt(code, language, file_path)
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt)
             
             # Parse the response to extract issues
             return self._parse_gemini_response(response.text, file_path)
             
         except Exception as e:
-            print(f"Error with Gemini analysis: {e}")
+            logger.warning("Error with Gemini analysis: %s", e)
             return self._fallback_logic_analysis(code, language, file_path)
     
+    def analyze_code_logic_batch(self, files: List[Dict[str, str]]) -> List[Dict]:
+        """Analyze the logic of several files, batching them into shared prompts sent concurrently."""
+        if self.use_cli or self.model:
+            batches = [files[start:start + self.BATCH_SIZE] for start in range(0, len(files), self.BATCH_SIZE)]
+            results = self._map_concurrently(self._analyze_batch, batches)
+        else:
+            results = [
+                self._fallback_logic_analysis(file_info["content"], file_info["language"], file_info["path"])
+                for file_info in files
+            ]
+        return [issue for file_issues in results for issue in file_issues]
+    
+    def _analyze_batch(self, files: List[Dict[str, str]]) -> List[Dict]:
+        """Analyze a batch of files with one Gemini CLI invocation or API request."""
+        if len(files) == 1:
+            file_info = files[0]
+            return self.analyze_code_logic(file_info["content"], file_info["language"], file_info["path"])
+        
+        try:
+            prompt = self._create_batch_analysis_prompt(files)
+            if self.use_cli:
+                response_text = self._analyze_with_cli(prompt)
+            else:
+                response_text = self._generate_content(prompt).text
+            issues = self._parse_batch_response(response_text, files) if response_text else None
+        except Exception as e:
+            logger.warning("Error with Gemini batch analysis: %s", e)
+            issues = None
+        
+        if issues is None:
+            issues = []
+            for file_info in files:
+                issues.extend(self._fallback_logic_analysis(
+                    file_info["content"], file_info["language"], file_info["path"]
+                ))
+        return issues
+    
     def _analyze_with_cli_logic(self, code: str, language: str, file_path: str) -> List[Dict]:
         """Analyze code logic using Gemini CLI."""
         try:
@@ -102,50 +292,51 @@ class GeminiAnalyzer:
                 return self._fallback_logic_analysis(code, language, file_path)
                 
         except Exception as e:
-            print(f"Error with Gemini CLI analysis: {e}")
+            logger.warning("Error with Gemini CLI analysis: %s", e)
             return self._fallback_logic_analysis(code, language, file_path)
     
     def _create_analysis_prompt(self, code: str, language: str, file_path: str) -> str:
         """Create a detailed prompt for Gemini analysis."""
-        return f"""
-Analyze the following {language} code for potential issues, bugs, and improvements.
-File: {file_path}
-
-Code:
-```{language}
-{code}
-```
-
-Please identify:
-1. Logic errors or potential bugs
-2. Code smell and design issues
-3. Performance problems
-4. Security vulnerabilities
-5. Maintainability concerns
-
-For each issue found, provide:
-- Type of issue
-- Severity level (CRITICAL, HIGH, MEDIUM, LOW, INFO)
-- Line number (if applicable)
-- Description of the problem
-- Suggested improvement
-
-Format your response as JSON with this structure:
-{{
-    "issues": [
-        {{
-            "type": "logic_error|security|performance|maintainability|code_smell",
-            "severity": "CRITICAL|HIGH|MEDIUM|LOW|INFO",
-            "title": "Brief title",
-            "description": "Detailed description",
-            "line": line_number,
-            "suggestion": "Improvement suggestion"
-        }}
-    ]
-}}
-
-Focus on practical, actionable feedback that will improve code quality.
-"""
+        return "".join((
+            f"\nAnalyze the following {language} code for potential issues, bugs, and improvements.\n"
+            f"File: {file_path}\n\nCode:\n```{language}\n",
+            code,
+            _ANALYSIS_INSTRUCTIONS
+        ))
+    
+    def _create_batch_analysis_prompt(self, files: List[Dict[str, str]]) -> str:
+        """Create one prompt covering several files."""
+        parts = ["\nAnalyze each of the following source files for potential issues, bugs, and improvements.\n\n"]
+        for file_info in files:
+            parts.append(f"File: {file_info['path']}\n```{file_info['language']}\n")
+            parts.append(file_info["content"])
+            parts.append("\n```\n\n")
+        parts.append(_BATCH_ANALYSIS_INSTRUCTIONS)
+        return "".join(parts)
+    
+    def _parse_batch_response(self, response_text: str, files: List[Dict[str, str]]) -> Optional[List[Dict]]:
+        """Parse a batched response, attributing issues to their files; None if it is not JSON."""
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        if start_idx == -1 or end_idx == 0:
+            return None
+        
+        try:
+            parsed = json.loads(response_text[start_idx:end_idx])
+        except json.JSONDecodeError:
+            return None
+        
+        paths = {file_info["path"] for file_info in files}
+        issues = []
+        for issue in parsed.get('issues', []):
+            file_path = issue.pop('file', None)
+            if file_path not in paths:
+                continue
+            issue['file_path'] = file_path
+            issue['source'] = 'gemini'
+            issues.append(issue)
+        
+        return issues
     
     def _parse_gemini_response(self, response_text: str, file_path: str) -> List[Dict]:
         """Parse Gemini's response to extract issues."""
@@ -173,74 +364,76 @@ Focus on practical, actionable feedback that will improve code quality.
     
     def _parse_text_response(self, response_text: str, file_path: str) -> List[Dict]:
         """Parse text response when JSON parsing fails."""
-        issues = []
-        lines = response_text.split('\n')
-        
-        current_issue = {}
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for issue indicators
-            if any(keyword in line.lower() for keyword in ['issue:', 'problem:', 'bug:', 'error:']):
-                if current_issue:
-                    issues.append(current_issue)
-                current_issue = {
-                    'type': 'logic_error',
-                    'severity': 'MEDIUM',
-                    'title': line,
-                    'description': line,
-                    'line': 1,
-                    'suggestion': 'Review and fix the identified issue',
-                    'file_path': file_path,
-                    'source': 'gemini'
-                }
-        
-        if current_issue:
-            issues.append(current_issue)
-            
-        return issues
+        return [
+            {
+                'type': 'logic_error',
+                'severity': 'MEDIUM',
+                'title': title,
+                'description': title,
+                'line': 1,
+                'suggestion': 'Review and fix the identified issue',
+                'file_path': file_path,
+                'source': 'gemini'
+            }
+            for title in (match.group().strip() for match in _ISSUE_MARKERS.finditer(response_text))
+        ]
     
     def _fallback_logic_analysis(self, code: str, language: str, file_path: str) -> List[Dict]:
         """Fallback analysis when Gemini is not available."""
         issues = []
-        lines = code.split('\n')
         
-        # Basic logic checks
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            
-            # Check for common logic issues
-            if language == 'python':
-                # Check for bare except clauses
-                if line_stripped == 'except:':
-                    issues.append({
-                        'type': 'logic_error',
-                        'severity': 'MEDIUM',
-                        'title': 'Bare Except Clause',
-                        'description': 'Bare except clause catches all exceptions',
-                        'line': i + 1,
-                        'suggestion': 'Specify the exception type or use Exception',
-                        'file_path': file_path,
-                        'source': 'fallback'
-                    })
+        # Basic logic checks over Python tokens, so strings and comments are ignored
+        if language == 'python':
+            division_lines = []
+            guarded_lines = set()
+            previous = None
+            for token in self._python_tokens(code):
+                line = token.start[0]
+                if token.type == tokenize.OP:
+                    # Check for bare except clauses
+                    if token.string == ':' and previous is not None and previous.string == 'except':
+                        issues.append({
+                            'type': 'logic_error',
+                            'severity': 'MEDIUM',
+                            'title': 'Bare Except Clause',
+                            'description': 'Bare except clause catches all exceptions',
+                            'line': line,
+                            'suggestion': 'Specify the exception type or use Exception',
+                            'file_path': file_path,
+                            'source': 'fallback'
+                        })
+                    # Check for potential division by zero
+                    elif token.string in _DIVISION_OPERATORS and (not division_lines or division_lines[-1] != line):
+                        division_lines.append(line)
+                elif token.type == tokenize.NAME and token.string == 'if':
+                    guarded_lines.add(line)
                 
-                # Check for potential division by zero
-                if '/' in line_stripped and 'if' not in line_stripped:
+                if token.type not in _TRIVIA_TOKENS:
+                    previous = token
+            
+            for line in division_lines:
+                if line not in guarded_lines:
                     issues.append({
                         'type': 'logic_error',
                         'severity': 'HIGH',
                         'title': 'Potential Division by Zero',
                         'description': 'Division operation without zero check',
-                        'line': i + 1,
+                        'line': line,
                         'suggestion': 'Add validation to ensure divisor is not zero',
                         'file_path': file_path,
                         'source': 'fallback'
                     })
+            issues.sort(key=lambda issue: issue['line'])
         
         return issues
     
+    def _python_tokens(self, code: str):
+        """Yield the Python tokens of ``code``, stopping quietly where it fails to tokenize."""
+        try:
+            yield from tokenize.generate_tokens(io.StringIO(code).readline)
+        except (tokenize.TokenError, SyntaxError):
+            return
+    
     def simulate_code_execution(self, code: str, language: str) -> Dict[str, Any]:
         """Simulate code execution to find runtime issues."""
         if not self.model:
@@ -265,7 +458,7 @@ Consider:
 Provide a brief analysis of what could go wrong during execution.
 """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt)
             return {
                 'simulation_results': response.text,
                 'potential_runtime_issues': self._extract_runtime_issues(response.text)
@@ -274,17 +467,16 @@ Provide a brief analysis of what could go wrong during execution.
         except Exception as e:
             return {'simulation_results': f'Simulation failed: {str(e)}'}
     
+    def simulate_files(self, files: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Simulate the execution of several files concurrently, in the order given."""
+        return self._map_concurrently(
+            lambda file_info: self.simulate_code_execution(file_info["content"], file_info["language"]),
+            files
+        )
+    
     def _extract_runtime_issues(self, simulation_text: str) -> List[str]:
         """Extract potential runtime issues from simulation results."""
-        issues = []
-        lines = simulation_text.split('\n')
-        
-        for line in lines:
-            if any(keyword in line.lower() for keyword in 
-                   ['exception', 'error', 'crash', 'fail', 'issue', 'problem']):
-                issues.append(line.strip())
-        
-        return issues
+        return [match.group().strip() for match in _RUNTIME_MARKERS.finditer(simulation_text)]
     
     def generate_improvement_suggestions(self, issues: List[Dict]) -> List[Dict]:
         """Generate detailed improvement suggestions using Gemini."""
@@ -300,23 +492,42 @@ Provide a brief analysis of what could go wrong during execution.
                     files_issues[file_path] = []
                 files_issues[file_path].append(issue)
             
-            enhanced_issues = []
-            for file_path, file_issues in files_issues.items():
-                enhanced = self._enhance_suggestions_for_file(file_issues, file_path)
-                enhanced_issues.extend(enhanced)
-            
-            return enhanced_issues
+            # Requests are I/O bound, so issue them concurrently
+            enhanced = self._map_concurrently(
+                lambda item: self._enhance_suggestions_for_file(item[1], item[0]),
+                list(files_issues.items())
+            )
+            return [issue for file_issues in enhanced for issue in file_issues]
             
         except Exception as e:
-            print(f"Error enhancing suggestions: {e}")
+            logger.warning("Error enhancing suggestions: %s", e)
             return issues
     
+    def _suggestion_key(self, issue: Dict) -> str:
+        """Cache key for an issue's enhanced suggestion, shared by identical issues in any file."""
+        text = f"{issue.get('type', '')}|{issue.get('title', '')}|{issue.get('description', '')[:200]}"
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    
     def _enhance_suggestions_for_file(self, issues: List[Dict], file_path: str) -> List[Dict]:
         """Enhance suggestions for issues in a specific file."""
         try:
+            # Reuse suggestions already generated for identical issues, and ask
+            # about each remaining distinct issue once
+            pending = {}
+            with self._suggestions_lock:
+                for issue in issues:
+                    key = self._suggestion_key(issue)
+                    suggestion = self._suggestions.get(key)
+                    if suggestion is not None:
+                        issue['enhanced_suggestion'] = suggestion
+                    else:
+                        pending.setdefault(key, []).append(issue)
+            if not pending:
+                return issues
+            
             issues_summary = "\n".join([
-                f"- {issue['title']}: {issue['description']}" 
-                for issue in issues
+                f"- {same[0]['title']}: {same[0]['description']}" 
+                for same in pending.values()
             ])
             
             prompt = f"""
@@ -330,16 +541,26 @@ Focus on best practices and modern coding standards.
 Format as: Issue -> Detailed Suggestion
 """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate_content(prompt)
             suggestions = response.text.split('\n')
             
             # Enhance original issues with better suggestions
-            for i, issue in enumerate(issues):
+            for i, (key, same) in enumerate(pending.items()):
                 if i < len(suggestions) and suggestions[i].strip():
-                    issue['enhanced_suggestion'] = suggestions[i].strip()
+                    suggestion = suggestions[i].strip()
+                    for issue in same:
+                        issue['enhanced_suggestion'] = suggestion
+                    self._remember_suggestion(key, suggestion)
             
             return issues
             
         except Exception as e:
-            print(f"Error enhancing suggestions for {file_path}: {e}")
+            logger.warning("Error enhancing suggestions for %s: %s", file_path, e)
             return issues
+    
+    def _remember_suggestion(self, key: str, suggestion: str):
+        """Cache a suggestion, evicting the oldest entry once the cache is full."""
+        with self._suggestions_lock:
+            if len(self._suggestions) >= self.SUGGESTION_CACHE_SIZE:
+                self._suggestions.pop(next(iter(self._suggestions)))
+            self._suggestions[key] = suggestion
@@ -1,15 +1,72 @@
+import codecs
+import logging
 import os
 import tempfile
 import shutil
-from pathlib import Path
-from typing import List, Dict, Optional
-import git
+import subprocess
+import threading
+import time
+from itertools import islice
+from typing import List, Dict, Iterator, Optional, Tuple
 import requests
+from charset_normalizer import from_bytes
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Read size used to discard oversized blobs from `git cat-file --batch`
+BLOB_SKIP_CHUNK_SIZE = 64 * 1024
+
+class GitCommandError(Exception):
+    """A git command exited with a non-zero status."""
+
+def run_git(*args: str, cwd: Optional[str] = None, input: Optional[str] = None, errors: str = 'strict') -> str:
+    """Run a git command and return its stdout, raising GitCommandError with git's message on failure.
+    
+    ``errors`` is the decoding error handler for git's output."""
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')  # Fail instead of prompting for credentials
+    try:
+        result = subprocess.run(
+            ['git', *args], cwd=cwd, env=env, input=input, capture_output=True, text=True, errors=errors
+        )
+    except OSError as e:
+        raise GitCommandError(f"git could not be run: {e}")
+    
+    if result.returncode != 0:
+        raise GitCommandError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+def _decode_source(raw: bytes) -> Optional[str]:
+    """Decode source bytes: BOM, then UTF-8, then a guess from the first 8 KB; None if undecodable."""
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw[len(codecs.BOM_UTF8):].decode('utf-8', errors='replace')
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return raw.decode('utf-16', errors='replace')
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        match = from_bytes(raw[:8192]).best()
+        if match is None:
+            return None  # Binary or unrecognisable content
+        return raw.decode(match.encoding, errors='replace')
+
 class GitHubParser:
     """Handles GitHub repository parsing and file extraction."""
     
+    # GitHub API responses by "owner/repo", shared across parsers:
+    # (fetched_at, etag, repo_info)
+    _api_cache: Dict[str, Tuple[float, str, Dict]] = {}
+    _api_cache_lock = threading.Lock()
+    
+    # Epoch time the exhausted API rate limit resets; cached info is served as is until then
+    _rate_limit_reset = 0.0
+    
+    # Serializes clones and fetches into CLONE_CACHE_DIR
+    _clone_cache_lock = threading.Lock()
+    
+    # Pooled keep-alive connections, so repeated API calls skip the TCP/TLS handshake
+    _http = requests.Session()
+    
     def __init__(self):
         self.config = Config()
         self.temp_dir = None
@@ -37,58 +94,221 @@ class GitHubParser:
             raise ValueError(f"Failed to parse GitHub URL: {str(e)}")
     
     def clone_repository(self, repo_url: str) -> str:
-        """Clone GitHub repository to temporary directory."""
+        """Clone GitHub repository into a bare repository, reusing the cached clone when enabled."""
+        cache_dir = self._clone_cache_path(repo_url)
+        if cache_dir:
+            # Cached clones outlive cleanup(); the lock keeps concurrent
+            # analyses from fetching into the same repository at once
+            self.temp_dir = None
+            with self._clone_cache_lock:
+                try:
+                    return self._update_cached_clone(repo_url, cache_dir)
+                except Exception as e:
+                    if os.path.exists(cache_dir):
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    raise Exception(f"Failed to clone repository: {str(e)}")
+        
         try:
             self.temp_dir = tempfile.mkdtemp()
-            print(f"Cloning repository to: {self.temp_dir}")
-            
-            git.Repo.clone_from(repo_url, self.temp_dir)
+            logger.info("Cloning repository to: %s", self.temp_dir)
+            self._clone_bare(repo_url, self.temp_dir)
             return self.temp_dir
         except Exception as e:
             if self.temp_dir and os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
             raise Exception(f"Failed to clone repository: {str(e)}")
     
+    def _clone_bare(self, repo_url: str, path: str):
+        """Clone the tip of the default branch without blobs or a working tree."""
+        # extract_code_files reads the blobs it needs straight from git
+        run_git(
+            'clone',
+            '--bare',
+            f"--depth={self.config.CLONE_DEPTH}",
+            "--single-branch",
+            "--no-tags",
+            "--filter=blob:none",
+            "--", repo_url, path
+        )
+    
+    def _clone_cache_path(self, repo_url: str) -> Optional[str]:
+        """Directory of the cached clone for a repository, or None when caching is off."""
+        if not self.config.CLONE_CACHE_DIR:
+            return None
+        try:
+            parsed = self.parse_github_url(repo_url)
+        except ValueError:
+            return None
+        return os.path.join(self.config.CLONE_CACHE_DIR, f"{parsed['owner']}__{parsed['repo']}")
+    
+    def _update_cached_clone(self, repo_url: str, cache_dir: str) -> str:
+        """Bring a cached clone up to the remote tip, cloning it first if needed."""
+        if os.path.exists(os.path.join(cache_dir, 'HEAD')):
+            logger.info("Updating cached clone: %s", cache_dir)
+            try:
+                # Only new commits and trees are transferred; blobs read by earlier
+                # analyses stay in the object store
+                run_git(
+                    'fetch',
+                    f"--depth={self.config.CLONE_DEPTH}",
+                    "--no-tags",
+                    "--filter=blob:none",
+                    "origin", "HEAD",
+                    cwd=cache_dir
+                )
+                run_git('update-ref', 'HEAD', 'FETCH_HEAD', cwd=cache_dir)
+                return cache_dir
+            except GitCommandError as e:
+                logger.warning("Cached clone could not be updated, cloning again: %s", e)
+                shutil.rmtree(cache_dir)
+        
+        logger.info("Cloning repository to: %s", cache_dir)
+        os.makedirs(self.config.CLONE_CACHE_DIR, exist_ok=True)
+        self._clone_bare(repo_url, cache_dir)
+        return cache_dir
+    
+    def _list_candidate_blobs(self, repo_path: str) -> List[Tuple[str, str, str]]:
+        """List (object id, path, language) for supported, non-hidden files in the HEAD tree."""
+        languages = self.config.SUPPORTED_EXTENSIONS
+        candidates = []
+        # Undecodable bytes in a filename survive as surrogates instead of
+        # failing the whole listing
+        listing = run_git('ls-tree', '-r', '-z', 'HEAD', cwd=repo_path, errors='surrogateescape')
+        for entry in listing.split('\0'):
+            meta, _, path = entry.partition('\t')
+            
+            # Prune by extension before any other per-entry work; the one lookup
+            # also resolves the language
+            language = languages.get(os.path.splitext(path)[1].lower())
+            if language is None:
+                continue
+            
+            # Skip hidden files and directories, and non-blob entries (submodules)
+            if path.startswith('.') or '/.' in path:
+                continue
+            _, object_type, object_id = meta.split()
+            if object_type != 'blob':
+                continue
+            
+            try:
+                path.encode('utf-8')
+            except UnicodeEncodeError:
+                logger.warning("Skipping file with an undecodable name: %r", path)
+                continue
+            candidates.append((object_id, path, language))
+        return candidates
+    
+    def _prefetch_blobs(self, repo_path: str, object_ids: List[str]):
+        """Fetch the given blobs from the promisor remote in a single request."""
+        try:
+            run_git(
+                '-c', 'fetch.negotiationAlgorithm=noop',
+                'fetch', '--no-tags', '--no-write-fetch-head', '--recurse-submodules=no',
+                '--filter=blob:none', '--stdin', 'origin',
+                cwd=repo_path, input=''.join(f"{object_id}\n" for object_id in object_ids)
+            )
+        except GitCommandError as e:
+            # cat-file falls back to fetching missing blobs one at a time
+            logger.warning("Batched blob fetch failed, fetching on demand: %s", e)
+    
+    def _read_blobs(self, repo_path: str, object_ids: List[str]) -> Iterator[Tuple[int, Optional[bytes]]]:
+        """Stream blob contents through one `git cat-file --batch` process.
+        
+        Yields (size, data) for each blob in order; data is None for blobs over
+        MAX_FILE_SIZE, which are not read, and (0, None) stands for a missing blob."""
+        process = subprocess.Popen(
+            ['git', 'cat-file', '--batch', '--buffer'], cwd=repo_path,
+            env=dict(os.environ, GIT_TERMINAL_PROMPT='0'),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        
+        def feed():
+            # Write every request up front from a separate thread, so git streams
+            # objects back-to-back instead of waiting on a round trip per blob
+            try:
+                process.stdin.write(''.join(f"{object_id}\n" for object_id in object_ids).encode())
+                process.stdin.close()
+            except OSError:
+                pass  # git exited early or the reader stopped
+        
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        try:
+            for _ in object_ids:
+                header = process.stdout.readline().split()
+                if not header:
+                    break  # git exited
+                if len(header) != 3:
+                    yield 0, None  # "<oid> missing"
+                    continue
+                size = int(header[2])
+                if size > self.config.MAX_FILE_SIZE:
+                    # Discard oversized objects without buffering them whole
+                    remaining = size
+                    while remaining:
+                        chunk = process.stdout.read(min(remaining, BLOB_SKIP_CHUNK_SIZE))
+                        if not chunk:
+                            break  # git exited
+                        remaining -= len(chunk)
+                    data = None
+                else:
+                    data = process.stdout.read(size)
+                process.stdout.read(1)  # Trailing newline after each object
+                yield size, data
+        finally:
+            # Closing our end stops git if it is still writing unread objects
+            process.stdout.close()
+            process.wait()
+            writer.join()
+    
+    def iter_code_files(self, repo_path: str) -> Iterator[Dict[str, str]]:
+        """Yield code files from the cloned repository's HEAD tree, reading blobs only as they are consumed."""
+        candidates = self._list_candidate_blobs(repo_path)
+        
+        # Fetch and read blobs one cap-sized window at a time, so a consumer that
+        # stops at MAX_FILES_TO_ANALYZE never pays for the rest of the repository
+        window = self.config.MAX_FILES_TO_ANALYZE
+        for start in range(0, len(candidates), window):
+            batch = candidates[start:start + window]
+            object_ids = [object_id for object_id, _, _ in batch]
+            self._prefetch_blobs(repo_path, object_ids)
+            
+            for (object_id, path, language), (size, data) in zip(batch, self._read_blobs(repo_path, object_ids)):
+                if data is None:
+                    if size > self.config.MAX_FILE_SIZE:
+                        # Oversized files are kept, without content, so the static
+                        # analysis reports them as too large
+                        yield {
+                            'path': path,
+                            'content': '',
+                            'language': language,
+                            'size': size,
+                            'content_hash': object_id
+                        }
+                    continue
+                
+                content = _decode_source(data)
+                if content is None:
+                    # Skip files that can't be read
+                    continue
+                
+                yield {
+                    'path': path,
+                    'content': content,
+                    'language': language,
+                    'size': size,  # Bytes in git, the unit MAX_FILE_SIZE is checked in
+                    'content_hash': object_id  # Git's blob id, equal for identical contents
+                }
+    
     def extract_code_files(self, repo_path: str) -> List[Dict[str, str]]:
-        """Extract code files from the cloned repository."""
+        """Extract code files from the cloned repository, up to MAX_FILES_TO_ANALYZE."""
         code_files = []
-        repo_path = Path(repo_path)
         
         try:
-            for file_path in repo_path.rglob('*'):
-                if file_path.is_file():
-                    # Skip hidden files, directories, and non-code files
-                    if any(part.startswith('.') for part in file_path.parts):
-                        continue
-                    
-                    # Check if file extension is supported
-                    if file_path.suffix.lower() in self.config.SUPPORTED_EXTENSIONS:
-                        # Check file size
-                        if file_path.stat().st_size > self.config.MAX_FILE_SIZE:
-                            continue
-                            
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                
-                            relative_path = file_path.relative_to(repo_path)
-                            code_files.append({
-                                'path': str(relative_path),
-                                'content': content,
-                                'language': self.config.SUPPORTED_EXTENSIONS[file_path.suffix.lower()],
-                                'size': len(content)
-                            })
-                            
-                            # Limit number of files to prevent overwhelming
-                            if len(code_files) >= self.config.MAX_FILES_TO_ANALYZE:
-                                break
-                                
-                        except (UnicodeDecodeError, PermissionError):
-                            # Skip files that can't be read
-                            continue
-                            
+            # Limit number of files to prevent overwhelming
+            code_files.extend(islice(self.iter_code_files(repo_path), self.config.MAX_FILES_TO_ANALYZE))
         except Exception as e:
-            print(f"Error extracting files: {str(e)}")
+            logger.warning("Error extracting files: %s", e)
             
         return code_files
     
@@ -97,20 +317,39 @@ class GitHubParser:
         if self.temp_dir and os.path.exists(self.temp_dir):
             try:
                 shutil.rmtree(self.temp_dir)
-                print("Cleaned up temporary directory")
+                logger.info("Cleaned up temporary directory")
             except Exception as e:
-                print(f"Error cleaning up: {str(e)}")
+                logger.warning("Error cleaning up: %s", e)
     
     def get_repository_info(self, repo_url: str) -> Dict:
         """Get basic repository information."""
         try:
             parsed = self.parse_github_url(repo_url)
+            key = f"{parsed['owner']}/{parsed['repo']}".lower()
             api_url = f"https://api.github.com/repos/{parsed['owner']}/{parsed['repo']}"
             
-            response = requests.get(api_url)
-            if response.status_code == 200:
+            with self._api_cache_lock:
+                cached = self._api_cache.get(key)
+            if cached and (time.monotonic() - cached[0] < self.config.GITHUB_API_CACHE_TTL
+                           or time.time() < GitHubParser._rate_limit_reset):
+                return dict(cached[2])
+            
+            headers = {'Accept': 'application/vnd.github+json'}
+            if self.config.GITHUB_TOKEN:
+                headers['Authorization'] = f"Bearer {self.config.GITHUB_TOKEN}"
+            if cached and cached[1]:
+                # Expired entries are revalidated; a 304 reuses the stored info
+                headers['If-None-Match'] = cached[1]
+            
+            response = self._http.get(api_url, headers=headers)
+            if response.headers.get('X-RateLimit-Remaining') == '0':
+                GitHubParser._rate_limit_reset = float(response.headers.get('X-RateLimit-Reset', 0))
+            if response.status_code == 304 and cached:
+                repo_info = cached[2]
+                etag = cached[1]
+            elif response.status_code == 200:
                 repo_data = response.json()
-                return {
+                repo_info = {
                     'name': repo_data.get('name', ''),
                     'description': repo_data.get('description', ''),
                     'language': repo_data.get('language', ''),
@@ -118,7 +357,17 @@ class GitHubParser:
                     'forks': repo_data.get('forks_count', 0),
                     'size': repo_data.get('size', 0)
                 }
+                etag = response.headers.get('ETag', '')
+            elif cached:
+                # Rate limited or failing; stale info beats none
+                return dict(cached[2])
+            else:
+                return {}
+            
+            with self._api_cache_lock:
+                self._api_cache[key] = (time.monotonic(), etag, repo_info)
+            return dict(repo_info)
         except Exception as e:
-            print(f"Error getting repository info: {str(e)}")
+            logger.warning("Error getting repository info: %s", e)
             
         return {}
@@ -1,19 +1,36 @@
-from typing import Dict, List, Any, TypedDict
+from typing import Dict, List, Any, Tuple, TypedDict
+from typing_extensions import Annotated
 from langgraph.graph import StateGraph, END
 from github_parser import GitHubParser
-from code_analyzer import StaticAnalyzer
+from code_analyzer import StaticAnalyzer, analyze_files
 from gemini_analyzer import GeminiAnalyzer
+from config import Config
 import json
+import logging
+from collections import Counter
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Report severity levels, and the score penalty per issue at each level
+_SEVERITY_LEVELS = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'INFO')
+_SEVERITY_PENALTIES = np.array([10, 5, 2, 1, 0])
+
+def _first_error(current: str, update: str) -> str:
+    """Keep the first error reported; the parallel analysis nodes may each report one."""
+    return current or update
 
 class AnalysisState(TypedDict):
     """State for the analysis pipeline."""
     repo_url: str
     repo_info: Dict[str, Any]
     code_files: List[Dict[str, str]]
+    unique_files: List[Dict[str, str]]
+    duplicate_paths: Dict[str, List[str]]
     static_issues: List[Dict[str, Any]]
     ai_issues: List[Dict[str, Any]]
     final_report: Dict[str, Any]
-    error: str
+    error: Annotated[str, _first_error]
 
 class IssueAnalyzerPipeline:
     """LangGraph-based pipeline for code analysis."""
@@ -33,14 +50,17 @@ class IssueAnalyzerPipeline:
         workflow.add_node("extract_files", self._extract_code_files)
         workflow.add_node("static_analysis", self._run_static_analysis)
         workflow.add_node("ai_analysis", self._run_ai_analysis)
+        workflow.add_node("enhance_suggestions", self._enhance_suggestions)
         workflow.add_node("generate_report", self._generate_final_report)
         
-        # Define the flow
+        # Define the flow; static and AI analysis run in parallel branches,
+        # which both finish before their issues are enhanced together
         workflow.set_entry_point("parse_repo")
         workflow.add_edge("parse_repo", "extract_files")
         workflow.add_edge("extract_files", "static_analysis")
-        workflow.add_edge("static_analysis", "ai_analysis")
-        workflow.add_edge("ai_analysis", "generate_report")
+        workflow.add_edge("extract_files", "ai_analysis")
+        workflow.add_edge(["static_analysis", "ai_analysis"], "enhance_suggestions")
+        workflow.add_edge("enhance_suggestions", "generate_report")
         workflow.add_edge("generate_report", END)
         
         return workflow.compile()
@@ -48,7 +68,7 @@ class IssueAnalyzerPipeline:
     def _parse_repository(self, state: AnalysisState) -> AnalysisState:
         """Parse GitHub repository and get basic info."""
         try:
-            print("🔍 Parsing repository...")
+            logger.info("Parsing repository...")
             repo_info = self.github_parser.get_repository_info(state["repo_url"])
             parsed_url = self.github_parser.parse_github_url(state["repo_url"])
             
@@ -56,18 +76,18 @@ class IssueAnalyzerPipeline:
                 **repo_info,
                 **parsed_url
             }
-            print(f"✅ Repository parsed: {repo_info.get('name', 'Unknown')}")
+            logger.info("Repository parsed: %s", repo_info.get('name', 'Unknown'))
             
         except Exception as e:
             state["error"] = f"Failed to parse repository: {str(e)}"
-            print(f"❌ Error parsing repository: {e}")
+            logger.error("Error parsing repository: %s", e)
         
         return state
     
     def _extract_code_files(self, state: AnalysisState) -> AnalysisState:
         """Extract code files from the repository."""
         try:
-            print("📁 Extracting code files...")
+            logger.info("Extracting code files...")
             
             # Clone repository
             repo_path = self.github_parser.clone_repository(state["repo_url"])
@@ -76,144 +96,149 @@ class IssueAnalyzerPipeline:
             code_files = self.github_parser.extract_code_files(repo_path)
             state["code_files"] = code_files
             
-            print(f"✅ Extracted {len(code_files)} code files")
+            # Identical files are analyzed once by both analysis branches, and
+            # their issues copied to the duplicates
+            state["unique_files"], state["duplicate_paths"] = self._deduplicate_files(code_files)
+            
+            logger.info("Extracted %d code files", len(code_files))
             
             # Cleanup
             self.github_parser.cleanup()
             
         except Exception as e:
             state["error"] = f"Failed to extract code files: {str(e)}"
-            print(f"❌ Error extracting files: {e}")
+            logger.error("Error extracting files: %s", e)
             self.github_parser.cleanup()
         
         return state
     
-    def _run_static_analysis(self, state: AnalysisState) -> AnalysisState:
-        """Run static code analysis."""
+    def _run_static_analysis(self, state: AnalysisState) -> Dict[str, Any]:
+        """Run static code analysis, returning only the state keys it writes."""
         try:
-            print("🔧 Running static analysis...")
+            logger.info("Running static analysis...")
             
-            all_issues = []
-            code_files = state.get("code_files", [])
-            
-            for file_info in code_files:
-                issues = self.static_analyzer.analyze_file(
-                    file_info["content"],
-                    file_info["language"],
-                    file_info["path"]
-                )
-                all_issues.extend(issues)
+            all_issues = analyze_files(state.get("unique_files", []), self.static_analyzer)
+            for issue in all_issues:
+                issue['source'] = 'static'
+            all_issues = self._replicate_issues(all_issues, state.get("duplicate_paths", {}))
             
-            state["static_issues"] = all_issues
-            print(f"✅ Found {len(all_issues)} static analysis issues")
+            logger.info("Found %d static analysis issues", len(all_issues))
+            return {"static_issues": all_issues}
             
         except Exception as e:
-            state["error"] = f"Static analysis failed: {str(e)}"
-            print(f"❌ Static analysis error: {e}")
-        
-        return state
+            logger.error("Static analysis error: %s", e)
+            return {"error": f"Static analysis failed: {str(e)}"}
     
-    def _run_ai_analysis(self, state: AnalysisState) -> AnalysisState:
-        """Run AI-powered analysis using Gemini."""
+    def _run_ai_analysis(self, state: AnalysisState) -> Dict[str, Any]:
+        """Run AI-powered analysis using Gemini, returning only the state keys it writes."""
         try:
             # Show which method is being used
             if self.gemini_analyzer.use_cli:
-                print("🤖 Running AI analysis using Gemini CLI...")
-            elif self.gemini_analyzer.model:
-                print("🤖 Running AI analysis using Gemini API...")
+                logger.info("Running AI analysis using Gemini CLI...")
+            elif self.gemini_analyzer.api_enabled:
+                logger.info("Running AI analysis using Gemini API...")
             else:
-                print("🤖 Running basic AI analysis (fallback mode)...")
+                logger.info("Running basic AI analysis (fallback mode)...")
             
             all_ai_issues = []
-            code_files = state.get("code_files", [])
-            
-            # Limit AI analysis to prevent overwhelming the API
-            files_to_analyze = code_files[:10]  # Analyze top 10 files
-            
-            for file_info in files_to_analyze:
-                # Run logic analysis
-                logic_issues = self.gemini_analyzer.analyze_code_logic(
-                    file_info["content"],
-                    file_info["language"],
-                    file_info["path"]
-                )
-                all_ai_issues.extend(logic_issues)
-                
-                # Run simulation (for smaller files)
-                if len(file_info["content"]) < 5000:  # Only simulate smaller files
-                    simulation = self.gemini_analyzer.simulate_code_execution(
-                        file_info["content"],
-                        file_info["language"]
-                    )
-                    
-                    # Convert simulation results to issues
-                    runtime_issues = simulation.get("potential_runtime_issues", [])
-                    for issue_text in runtime_issues:
-                        all_ai_issues.append({
-                            'type': 'runtime_risk',
-                            'severity': 'MEDIUM',
-                            'title': 'Potential Runtime Issue',
-                            'description': issue_text,
-                            'line': 1,
-                            'suggestion': 'Review code for runtime safety',
-                            'file_path': file_info["path"],
-                            'source': 'gemini_simulation'
-                        })
-            
-            # Enhance suggestions for all issues
-            static_issues = state.get("static_issues", [])
-            all_issues = static_issues + all_ai_issues
-            enhanced_issues = self.gemini_analyzer.generate_improvement_suggestions(all_issues)
             
-            state["ai_issues"] = all_ai_issues
-            state["static_issues"] = enhanced_issues[:len(static_issues)]  # Update static issues
-            state["ai_issues"] = enhanced_issues[len(static_issues):]      # Update AI issues
+            # Limit AI analysis to prevent overwhelming the API; oversized files
+            # were extracted without content and are left to the static report
+            files_to_analyze = [
+                f for f in state.get("unique_files", []) if f["size"] <= Config.MAX_FILE_SIZE
+            ][:10]  # Analyze top 10 distinct files
+            # Smallest first, so batches group files of similar size and cheap requests finish early
+            files_to_analyze.sort(key=lambda f: f["size"])
+            
+            # Run logic analysis (batched into shared prompts on the CLI);
+            # requests for different files run concurrently
+            all_ai_issues.extend(self.gemini_analyzer.analyze_code_logic_batch(files_to_analyze))
+            
+            # Run simulation (for smaller files)
+            files_to_simulate = [f for f in files_to_analyze if f["size"] < 5000]
+            simulations = self.gemini_analyzer.simulate_files(files_to_simulate)
+            
+            for file_info, simulation in zip(files_to_simulate, simulations):
+                # Convert simulation results to issues
+                runtime_issues = simulation.get("potential_runtime_issues", [])
+                for issue_text in runtime_issues:
+                    all_ai_issues.append({
+                        'type': 'runtime_risk',
+                        'severity': 'MEDIUM',
+                        'title': 'Potential Runtime Issue',
+                        'description': issue_text,
+                        'line': 1,
+                        'suggestion': 'Review code for runtime safety',
+                        'file_path': file_info["path"],
+                        'source': 'gemini_simulation'
+                    })
+            
+            all_ai_issues = self._replicate_issues(all_ai_issues, state.get("duplicate_paths", {}))
+            
+            logger.info("Found %d AI analysis issues", len(all_ai_issues))
+            return {"ai_issues": all_ai_issues}
+            
+        except Exception as e:
+            logger.error("AI analysis error: %s", e)
+            return {"error": f"AI analysis failed: {str(e)}"}
+    
+    def _enhance_suggestions(self, state: AnalysisState) -> Dict[str, Any]:
+        """Enhance suggestions for the static and AI issues together, once both analyses finish."""
+        try:
+            logger.info("Enhancing suggestions...")
+            
+            all_issues = state.get("static_issues", []) + state.get("ai_issues", [])
+            enhanced_issues = self.gemini_analyzer.generate_improvement_suggestions(all_issues)
             
-            print(f"✅ Found {len(all_ai_issues)} AI analysis issues")
+            # Split the enhanced issues back by source rather than by position
+            static_issues, ai_issues = [], []
+            for issue in enhanced_issues:
+                (static_issues if issue.get('source') == 'static' else ai_issues).append(issue)
+            return {"static_issues": static_issues, "ai_issues": ai_issues}
             
         except Exception as e:
-            state["error"] = f"AI analysis failed: {str(e)}"
-            print(f"❌ AI analysis error: {e}")
+            logger.error("Suggestion enhancement error: %s", e)
+            return {"error": f"Suggestion enhancement failed: {str(e)}"}
+    
+    def _deduplicate_files(self, code_files: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], Dict[str, List[str]]]:
+        """Keep one file per distinct content, mapping each kept path to the paths of its duplicates."""
+        unique = {}
+        duplicate_paths = {}
+        for file_info in code_files:
+            key = file_info.get("content_hash") or file_info["path"]
+            first = unique.setdefault(key, file_info)
+            if first is not file_info:
+                duplicate_paths.setdefault(first["path"], []).append(file_info["path"])
+        return list(unique.values()), duplicate_paths
+    
+    def _replicate_issues(self, issues: List[Dict[str, Any]], duplicate_paths: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Copy issues found in a file to each of its identical duplicates."""
+        if not duplicate_paths:
+            return issues
         
-        return state
+        copies = [
+            {**issue, 'file_path': path}
+            for issue in issues
+            for path in duplicate_paths.get(issue.get('file_path'), ())
+        ]
+        return issues + copies
     
     def _generate_final_report(self, state: AnalysisState) -> AnalysisState:
         """Generate the final analysis report."""
         try:
-            print("📊 Generating final report...")
+            logger.info("Generating final report...")
             
             static_issues = state.get("static_issues", [])
             ai_issues = state.get("ai_issues", [])
             all_issues = static_issues + ai_issues
             
-            # Categorize issues by severity
-            severity_counts = {
-                'CRITICAL': 0,
-                'HIGH': 0,
-                'MEDIUM': 0,
-                'LOW': 0,
-                'INFO': 0
-            }
-            
-            for issue in all_issues:
-                severity = issue.get('severity', 'MEDIUM')
-                if severity in severity_counts:
-                    severity_counts[severity] += 1
-            
-            # Categorize by type
-            type_counts = {}
-            for issue in all_issues:
-                issue_type = issue.get('type', 'unknown')
-                type_counts[issue_type] = type_counts.get(issue_type, 0) + 1
+            # Categorize issues by severity and type
+            severity_counts, type_counts = self._count_issues(all_issues)
             
             # Calculate overall score (0-100, higher is better)
             total_issues = len(all_issues)
-            critical_weight = severity_counts['CRITICAL'] * 10
-            high_weight = severity_counts['HIGH'] * 5
-            medium_weight = severity_counts['MEDIUM'] * 2
-            low_weight = severity_counts['LOW'] * 1
-            
-            penalty_score = critical_weight + high_weight + medium_weight + low_weight
+            counts = np.array([severity_counts[level] for level in _SEVERITY_LEVELS])
+            penalty_score = int(counts @ _SEVERITY_PENALTIES)
             code_files_count = len(state.get("code_files", []))
             
             # Base score calculation
@@ -232,7 +257,7 @@ class IssueAnalyzerPipeline:
                     'issue_types': type_counts
                 },
                 'issues': all_issues,
-                'recommendations': self._generate_recommendations(all_issues),
+                'recommendations': self._generate_recommendations(severity_counts, type_counts),
                 'analysis_metadata': {
                     'static_analysis_issues': len(static_issues),
                     'ai_analysis_issues': len(ai_issues),
@@ -241,29 +266,28 @@ class IssueAnalyzerPipeline:
             }
             
             state["final_report"] = report
-            print("✅ Final report generated successfully")
+            logger.info("Final report generated successfully")
             
         except Exception as e:
             state["error"] = f"Report generation failed: {str(e)}"
-            print(f"❌ Report generation error: {e}")
+            logger.error("Report generation error: %s", e)
         
         return state
     
-    def _generate_recommendations(self, issues: List[Dict]) -> List[str]:
-        """Generate high-level recommendations based on issues found."""
-        recommendations = []
-        
-        # Count issues by type
-        type_counts = {}
-        severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-        
+    def _count_issues(self, issues: List[Dict]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Count issues by severity (the known levels only) and by type in a single pass."""
+        severities = Counter()
+        types = Counter()
         for issue in issues:
-            issue_type = issue.get('type', 'unknown')
-            type_counts[issue_type] = type_counts.get(issue_type, 0) + 1
-            
-            severity = issue.get('severity', 'MEDIUM')
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+            severities[issue.get('severity', 'MEDIUM')] += 1
+            types[issue.get('type', 'unknown')] += 1
+        
+        severity_counts = {level: severities[level] for level in _SEVERITY_LEVELS}
+        return severity_counts, dict(types)
+    
+    def _generate_recommendations(self, severity_counts: Dict[str, int], type_counts: Dict[str, int]) -> List[str]:
+        """Generate high-level recommendations based on issue counts."""
+        recommendations = []
         
         # Generate recommendations based on patterns
         if severity_counts['CRITICAL'] > 0:
@@ -294,12 +318,14 @@ class IssueAnalyzerPipeline:
     def analyze(self, repo_url: str) -> Dict[str, Any]:
         """Run the complete analysis pipeline."""
         try:
-            print(f"🚀 Starting analysis for: {repo_url}")
+            logger.info("Starting analysis for: %s", repo_url)
             
             initial_state = AnalysisState(
                 repo_url=repo_url,
                 repo_info={},
                 code_files=[],
+                unique_files=[],
+                duplicate_paths={},
                 static_issues=[],
                 ai_issues=[],
                 final_report={},